@@ -0,0 +1,207 @@
+"""
+    Benchmark of the rendering speed (frames per second) and peak memory of the signals
+
+    python benchmark.py                 run the benchmarks and compare them to the baseline (exit code 1 on regression,
+                                        2 when the baseline is missing or has none of the benchmarks run)
+    python benchmark.py --save          run the benchmarks and save them as the baseline
+    python benchmark.py -k Harmonic     only run the benchmarks whose name contains "Harmonic"
+
+    The renders bypass the render cache, the peak memory is measured with `tracemalloc` (numpy allocations included).
+    The baseline is specific to a machine : save it again after changing of machine or of numpy version.
+"""
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from signals import *
+from signals.core.SignalSample import SignalSample
+from signals.core.TimeSample import TimeSample
+
+BASELINE_FILEPATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+FRAME_RATE = 44100
+MIN_RUN_TIME = 0.1
+MEMORY_SLACK = 2 ** 16
+
+
+def render(signal):
+    return lambda time_sample: signal.sample_array(time_sample)
+
+
+def render_frame_by_frame(signal):
+    """Render through the generic `Signal.i_sample_data` (one `__call__` per frame)"""
+    return lambda time_sample: np.fromiter(map(signal, time_sample), dtype=float, count=len(time_sample))
+
+
+def render_generator(signal):
+    """Render through the `i_sample_data` of the signal"""
+    return lambda time_sample: np.fromiter(signal.i_sample_data(time_sample), dtype=float, count=len(time_sample))
+
+
+def write_wave(sampwidth, float_pcm=False):
+    signal = Sine(440, amplitude=0.5) + Sine(660, amplitude=0.25)
+
+    def run(time_sample):
+        sample = SignalSample(time_sample, signal.sample_array(time_sample))
+        sample.to_wave(io.BytesIO(), sampwidth=sampwidth, float_pcm=float_pcm)
+
+    return run
+
+
+def example_1():
+    """The patch of `example_1.py`"""
+    harmonic_serie = HarmonicSerie(base_frequency=220.0, number_of_harmonics=30,
+                                   harmonics_amplitude_function=named("exponential", rate=-0.5))
+    return harmonic_serie + WhiteNoise(amplitude=0.075, seed=0)
+
+
+def benchmarks():
+    """Return the benchmarks as a dict name -> (function of a time sample, duration in seconds)"""
+    sine = Sine(440)
+    recording = Sine(220).sample_array(TimeSample(t_min=0, n_frames=10 * FRAME_RATE, frame_rate=FRAME_RATE))
+
+    signals = {
+        "Sine": Sine(440),
+        "Cosine": Cosine(440),
+        "FSine": FSine(lambda t: 440 + 10 * np.sin(math.tau * 5 * t)),
+        "FCosine": FCosine(lambda t: 440 + 10 * np.sin(math.tau * 5 * t)),
+        "WhiteNoise": WhiteNoise(1.0, seed=0),
+        "GaussianNoise": GaussianNoise(1.0, 0.0, 0.3, seed=0),
+        "ColoredNoise(pink)": ColoredNoise(1.0, "pink", seed=0),
+        "ColoredNoise(brown)": ColoredNoise(1.0, "brown", seed=0),
+        "Click": Click(0.01),
+        "ClickTrain": ClickTrain(4, 0.01),
+        "Envelop": Envelop(sine, lambda t: np.exp(-t)),
+        "Breakpoints": Breakpoints([(0, 0), (0.1, 1), (0.5, 0.3), (1, 0)]),
+        "ADSR": ADSR(0.01, 0.1, 0.7, 0.3, 0.5),
+        "AmplitudeModulation": AmplitudeModulation(Sine(440), Sine(3), 0.5),
+        "FrequencyModulation": FrequencyModulation(Sine(440), Sine(3), 10),
+        "FunctionSignal": FunctionSignal(lambda t: math.sin(math.tau * 440 * t)),
+        "Wavetable": Wavetable(HarmonicSerie(1, 20), 440),
+        "SampledSignal": SampledSignal(recording, FRAME_RATE, rate=1.5),
+        "HarmonicSerie(10)": HarmonicSerie(220, 10),
+        "HarmonicSerie(100)": HarmonicSerie(20, 100),
+        "HarmonicSerie(1000)": HarmonicSerie(2, 1000),
+        "SignalSum(8 Sine)": SignalSum(*(Sine(110 * k, 1 / k) for k in range(1, 9))),
+        "SignalProd(Sine, ADSR)": SignalProd(Sine(440), ADSR(0.01, 0.1, 0.7, 0.3, 0.5)),
+        "example_1": example_1(),
+    }
+
+    result = {name: (render(signal), 1.0) for name, signal in signals.items()}
+
+    # the "50% faster" generators of Sine and Cosine, against the generic frame by frame rendering
+    result["Sine.i_sample_data"] = (render_generator(Sine(440)), 0.25)
+    result["Cosine.i_sample_data"] = (render_generator(Cosine(440)), 0.25)
+    result["Sine frame by frame"] = (render_frame_by_frame(Sine(440)), 0.25)
+
+    for duration in (1.0, 10.0):
+        for sampwidth in (1, 2, 3, 4):
+            result[f"to_wave({duration:g}s, sampwidth={sampwidth})"] = (write_wave(sampwidth), duration)
+        result[f"to_wave({duration:g}s, float)"] = (write_wave(4, float_pcm=True), duration)
+
+    return result
+
+
+def measure(function, duration, repeat=5):
+    """
+        Return the best frames per second over `repeat` runs and the peak memory (in bytes) of one call
+        Each run calls the function as many times as needed to last at least `MIN_RUN_TIME` seconds
+    """
+    time_sample = TimeSample(t_min=0, n_frames=int(duration * FRAME_RATE), frame_rate=FRAME_RATE)
+
+    best = math.inf
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function(time_sample)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_RUN_TIME:
+                break
+        best = min(best, elapsed / calls)
+
+    tracemalloc.start()
+    function(time_sample)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return dict(frames_per_second=len(time_sample) / best, peak_memory=peak_memory)
+
+
+def compare(results, baseline, threshold):
+    """
+        Return the names of the benchmarks which regressed by more than `threshold` (relative) from the baseline
+        Memory differences below `MEMORY_SLACK` bytes are ignored
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]
+        slower = result['frames_per_second'] < reference['frames_per_second'] * (1 - threshold)
+        heavier = result['peak_memory'] > reference['peak_memory'] * (1 + threshold) + MEMORY_SLACK
+        if slower or heavier:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark of the signals rendering")
+    parser.add_argument("--save", action="store_true", help="save the results as the baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILEPATH, help="the path of the baseline json file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="the relative slow down (or memory increase) considered as a regression")
+    parser.add_argument("--repeat", type=int, default=5, help="the number of timed runs of each benchmark")
+    parser.add_argument("-k", dest="keyword", default="", help="only run the benchmarks containing this keyword")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = {}
+    for name, (function, duration) in benchmarks().items():
+        if args.keyword not in name:
+            continue
+        results[name] = result = measure(function, duration, args.repeat)
+
+        line = f"{name:<32} {result['frames_per_second']:>14,.0f} frames/s {result['peak_memory'] / 2 ** 20:>9.2f} MB"
+        if name in baseline:
+            ratio = result['frames_per_second'] / baseline[name]['frames_per_second']
+            line += f"   x{ratio:.2f} speed"
+        print(line)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, "w") as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"no baseline at {args.baseline}, run `python benchmark.py --save` to create it")
+        return 2
+
+    missing = [name for name in results if name not in baseline]
+    if missing:
+        print(f"{len(missing)} benchmark(s) missing from the baseline : {', '.join(missing)}")
+        if len(missing) == len(results):
+            return 2
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} : {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
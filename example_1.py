@@ -2,14 +2,13 @@
     Harmonic serie with noise, sampled, saved and played
 """
 from signals import *
-import math
 
 if __name__ == '__main__':
     # we create the harmonic serie
     harmonic_serie = HarmonicSerie(
         base_frequency=220.0,
         number_of_harmonics=30,
-        harmonics_amplitude_function=lambda n: math.exp(-n / 2)
+        harmonics_amplitude_function=named("exponential", rate=-0.5)
     )
 
     # and we add some noise to it (stored in a different variable `harmonic_serie_with_noise` )
@@ -0,0 +1,43 @@
+from .Breakpoints import Breakpoints
+
+
+class ADSR(Breakpoints):
+    """
+        Attack / Decay / Sustain / Release envelope of a note held for `duration` seconds from `t_start`
+        If the note is released before the end of the decay, the release starts from the level reached at that time.
+    """
+
+    def __init__(self, attack: float, decay: float, sustain: float, release: float, duration: float,
+                 t_start: float = 0.0, peak: float = 1.0, curve: str = "linear"):
+        """
+        :param attack: time (in seconds) to rise from 0 to `peak`
+        :param decay: time (in seconds) to fall from `peak` to the sustain level
+        :param sustain: the sustain level, relative to `peak`
+        :param release: time (in seconds) to fall to 0 once the note is released
+        :param duration: time (in seconds) between the start of the note and its release
+        :param t_start: the start time of the note
+        :param peak: the maximum level of the envelope
+        :param curve: "linear" or "exponential" (see Breakpoints)
+        """
+        assert attack >= 0 and decay >= 0 and release >= 0 and duration >= 0
+        self.attack = attack
+        self.decay = decay
+        self.sustain = sustain
+        self.release = release
+        self.duration = duration
+        self.t_start = t_start
+        self.peak = peak
+
+        held = Breakpoints([
+            (t_start, 0.0),
+            (t_start + attack, peak),
+            (t_start + attack + decay, sustain * peak),
+        ], curve=curve)
+
+        t_release = t_start + duration
+        points = [(t, value) for t, value in held.points if t < t_release]
+        points += [(t_release, held(t_release)), (t_release + release, 0.0)]
+        super().__init__(points, curve=curve)
+
+    def __repr__(self):
+        return f"ADSR({self.attack}, {self.decay}, {self.sustain}, {self.release}, {self.duration}, t_start={self.t_start})"
@@ -16,6 +16,16 @@ class AmplitudeModulation(Signal):
         # TODO : find a way to rewrite factor as modulation_depth (which is include in [0, 1])
         #  to do so, we need to have the max_amplitude for any signal which can be `carrier` or `carried`
 
+    @property
+    def support(self):
+        return self.carrier.support
+
+    def support_between(self, t_min, t_max):
+        return self.carrier.support_between(t_min, t_max)
+
     def __call__(self, t):
         # xp + k * xp * xm = xp * (1 + k * xm)
         return self.carrier(t) * (1 + self.factor * self.carried(t))
+
+    def sample_array(self, time_sample):
+        return self.carrier.sample_array(time_sample) * (1 + self.factor * self.carried.sample_array(time_sample))
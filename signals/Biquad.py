@@ -0,0 +1,79 @@
+from math import cos, sin, tau
+
+import numpy as np
+
+from .core.Filter import Filter
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+
+class Biquad(Filter):
+    """
+        Second order IIR filter (the "Audio EQ Cookbook" formulas of Robert Bristow-Johnson)
+        The filtering uses `scipy.signal.lfilter` when scipy is installed, else a vectorized numpy solution of the recurrence
+    """
+    kinds = ("lowpass", "highpass", "bandpass", "notch")
+
+    def __init__(self, signal, kind: str = "lowpass", frequency: float = 1000.0, q: float = 0.7071067811865476,
+                 frame_rate: float = 44100.0):
+        """
+        :param signal: the input of the filter
+        :param kind: "lowpass", "highpass", "bandpass" (0dB peak gain) or "notch"
+        :param frequency: the cutoff (or center) frequency, in Hz
+        :param q: the quality factor, 1/sqrt(2) gives the flattest pass band for the low and high pass
+        :param frame_rate: the frame grid used when the filter is evaluated at a single time (see `Filter.__call__`)
+        """
+        super().__init__(signal, frame_rate)
+        assert kind in self.kinds, f"Biquad.__init__, kind shall be one of {self.kinds}"
+        assert frequency > 0 and q > 0
+        self.kind = kind
+        self.frequency = frequency
+        self.q = q
+
+    def coefficients(self, frame_width):
+        """The (b, a) coefficients of the filter, normalized so that a[0] = 1"""
+        w0 = tau * self.frequency * frame_width
+        assert w0 < tau / 2, f"Biquad.coefficients, the frequency {self.frequency}Hz is above the nyquist frequency"
+        alpha = sin(w0) / (2 * self.q)
+        c = cos(w0)
+
+        if self.kind == "lowpass":
+            b = [(1 - c) / 2, 1 - c, (1 - c) / 2]
+        elif self.kind == "highpass":
+            b = [(1 + c) / 2, -(1 + c), (1 + c) / 2]
+        elif self.kind == "bandpass":
+            b = [alpha, 0.0, -alpha]
+        else:
+            b = [1.0, -2 * c, 1.0]
+        a = [1 + alpha, -2 * c, 1 - alpha]
+        return np.array(b) / a[0], np.array(a) / a[0]
+
+    def initial_state(self, frame_width):
+        return np.zeros(2)
+
+    def process(self, values, state, frame_width):
+        b, a = self.coefficients(frame_width)
+        if lfilter is not None:
+            return lfilter(b, a, values, zi=state)
+
+        # transposed direct form II, as lfilter : the state follows z[n] = A z[n - 1] + B x[n], y[n] = b0 x[n] + z1[n - 1]
+        # the recurrence is solved by doubling (z[n] += A^k z[n - k] for k = 1, 2, 4, ...), log2(len(values)) numpy passes
+        b0, b1, b2 = b.tolist()
+        _, a1, a2 = a.tolist()
+        matrix = np.array([[-a1, 1.0], [-a2, 0.0]])
+        states = np.outer(values, [b1 - a1 * b0, b2 - a2 * b0])
+        if len(values):
+            states[0] += matrix @ state
+        power, shift = matrix, 1
+        while shift < len(values):
+            states[shift:] += states[:-shift] @ power.T
+            power, shift = power @ power, 2 * shift
+
+        previous = np.concatenate([state[:1], states[:-1, 0]])
+        return b0 * values + previous, (states[-1] if len(values) else state).copy()
+
+    def __repr__(self):
+        return f"Biquad({self.signal!r}, {self.kind!r}, {self.frequency})"
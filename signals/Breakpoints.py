@@ -0,0 +1,75 @@
+import numpy as np
+
+from .core import Signal
+
+
+class Breakpoints(Signal):
+    """
+        Piecewise envelope going through the given (time, value) points
+        The first value is held before the first point and the last value after the last point.
+        It can be used as the `amplitude_function` of an Envelop or as a factor of a SignalProd.
+    """
+    curves = ("linear", "exponential")
+
+    def __init__(self, points, curve: str = "linear", floor: float = 1e-4):
+        """
+        :param points: the (time, value) points, sorted by time
+        :param curve: "linear" or "exponential" (constant ratio per second between two points, for a natural decay)
+        :param floor: the smallest magnitude used by exponential segments (which can't reach 0)
+        """
+        assert points, "Breakpoints.__init__, at least one point is required"
+        assert curve in self.curves, f"Breakpoints.__init__, curve shall be one of {self.curves}"
+        self.points = [(float(t), float(value)) for t, value in points]
+        self.curve = curve
+        self.floor = floor
+
+        self.times = np.array([t for t, _ in self.points])
+        self.values = np.array([value for _, value in self.points])
+        assert np.all(np.diff(self.times) >= 0), "Breakpoints.__init__, the points shall be sorted by time"
+
+    @property
+    def period(self):
+        return 0
+
+    @property
+    def support(self):
+        """From the last of the leading 0 points to the first of the trailing 0 points"""
+        nonzero = np.flatnonzero(self.values)
+        if not len(nonzero):
+            return []
+        first, last = nonzero[0], nonzero[-1]
+        start = self.times[first - 1] if first > 0 else float('-inf')
+        end = self.times[last + 1] if last + 1 < len(self.points) else float('inf')
+        return [(float(start), float(end))]
+
+    def values_at(self, times):
+        if len(self.points) == 1:
+            return np.full(len(times), self.values[0])
+
+        # segment lookup : one binary search per frame of the block, no python loop
+        index = np.clip(np.searchsorted(self.times, times, side='right') - 1, 0, len(self.points) - 2)
+        start, stop = self.times[index], self.times[index + 1]
+        width = stop - start
+        x = np.clip(np.divide(times - start, width, out=np.ones(len(times)), where=width > 0), 0.0, 1.0)
+
+        v0, v1 = self.values[index], self.values[index + 1]
+        if self.curve == "linear":
+            return v0 + x * (v1 - v0)
+
+        # only segments keeping the same sign can be exponential, a segment towards (or from) 0
+        # decays towards (or rises from) the floor and jumps to 0 at its end
+        exponential = (v0 * v1 > 0) | ((v0 == 0) != (v1 == 0))
+        sign = np.sign(v0 + v1)
+        l0 = np.log(np.maximum(np.abs(v0), self.floor))
+        l1 = np.log(np.maximum(np.abs(v1), self.floor))
+        result = np.where(exponential, sign * np.exp(l0 + x * (l1 - l0)), v0 + x * (v1 - v0))
+        return np.where(x >= 1, v1, np.where(x <= 0, v0, result))
+
+    def __call__(self, t):
+        return float(self.values_at(np.array([float(t)]))[0])
+
+    def sample_array(self, time_sample):
+        return self.values_at(time_sample.to_array())
+
+    def __repr__(self):
+        return f"Breakpoints({self.points}, {self.curve!r})"
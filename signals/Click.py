@@ -1,3 +1,5 @@
+import numpy as np
+
 from .core import Signal
 
 __authors__ = ["Elie Grinfeder", "Gabriel Amare"]
@@ -13,5 +15,13 @@ class Click(Signal):
     def __call__(self, t):
         return self.amplitude if 0 <= t - self.phase < self.duration else 0
 
+    @property
+    def support(self):
+        return [(self.phase, self.phase + self.duration)]
+
+    def sample_array(self, time_sample):
+        local = time_sample.to_array() - self.phase
+        return np.where((0 <= local) & (local < self.duration), float(self.amplitude), 0.0)
+
     def __repr__(self):
         return f"{self.amplitude} * ({self.phase} <= t < {self.phase + self.duration})"
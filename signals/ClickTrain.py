@@ -1,6 +1,8 @@
 from .core import SimpleSignal
 from math import tau
 
+import numpy as np
+
 __authors__ = ["Elie Grinfeder", "Gabriel Amare"]
 
 
@@ -24,6 +26,10 @@ class ClickTrain(SimpleSignal):
     def __call__(self, t):
         return self.amplitude if 0 <= (t - self.phase / tau) % self.period < self.duration else 0
 
+    def sample_array(self, time_sample):
+        local = (time_sample.to_array() - self.phase / tau) % self.period
+        return np.where((0 <= local) & (local < self.duration), float(self.amplitude), 0.0)
+
     def __repr__(self):
         amplitude = self.amplitude
         duration = self.duration
@@ -0,0 +1,48 @@
+from .core import Signal
+from .core.noise import new_seed, first_frame, voss_values
+
+
+class ColoredNoise(Signal):
+    """
+        Pink (1/f) or brown (1/f^2) noise between [-amplitude, +amplitude], built with the Voss-McCartney algorithm
+    """
+    colors = ("pink", "brown")
+
+    def __init__(self, amplitude: float, color: str = "pink", seed: int = None, octaves: int = 16,
+                 frame_rate: float = 44100.0):
+        """
+        :param amplitude: The maximum amplitude of the signal
+        :param color: "pink" or "brown"
+        :param seed: The seed of the noise, for a given seed `sample_array` always gives the same values for the same frames
+        :param octaves: The number of random rows, the spectrum is shaped down to frame_rate / 2 ** octaves
+        :param frame_rate: The frame grid used when the noise is evaluated at a single time (see `__call__`),
+            `sample_array` uses the frames of the time sample
+        """
+        assert color in self.colors, f"ColoredNoise.__init__, color shall be one of {self.colors}"
+        assert octaves > 0
+        self.amplitude = abs(amplitude)
+        self.color = color
+        self.seed = new_seed() if seed is None else seed
+        self.octaves = octaves
+        self.frame_rate = frame_rate
+
+    @property
+    def period(self):
+        return 0
+
+    @property
+    def weights(self):
+        if self.color == "pink":
+            return [1.0] * self.octaves
+        else:
+            return [2 ** (row / 2) for row in range(self.octaves)]
+
+    def __call__(self, t):
+        """The value of the frame of `frame_rate` holding t (the same as `sample_array` at that frame rate)"""
+        return self.amplitude * voss_values(self.seed, round(t * self.frame_rate), 1, self.weights)[0]
+
+    def sample_array(self, time_sample):
+        return self.amplitude * voss_values(self.seed, first_frame(time_sample), len(time_sample), self.weights)
+
+    def __repr__(self):
+        return f"{self.amplitude} * {self.color.capitalize()}Noise()"
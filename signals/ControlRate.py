@@ -0,0 +1,65 @@
+from math import floor, ceil
+
+import numpy as np
+
+from .core import Signal
+from .core.TimeSample import TimeSample
+from .core.utils import sample_parameter, interpolate, INTERPOLATIONS
+
+
+class ControlRate(Signal):
+    """
+        Evaluate a slowly changing modulator once every `interval` frames and interpolate it up to the audio rate
+        (the k-rate of Csound). The modulator is evaluated `interval` times less, at the cost of an error bounded
+        by `error_bound`.
+        The control points lie on a fixed grid of time, so rendering block by block gives the same result.
+        It can be used anywhere a modulator is expected : the `amplitude_function` of an Envelop, the `carried`
+        signal of an AmplitudeModulation / FrequencyModulation or the parameters of FSine / FCosine.
+    """
+    error_factors = {"linear": 1 / 8, "cubic": 3 / 128}
+
+    def __init__(self, modulator, interval: int = 64, interpolation: str = "linear"):
+        """
+        :param modulator: a signal or a callable of time
+        :param interval: the number of audio frames between two evaluations of the modulator
+        :param interpolation: "linear" or "cubic"
+        """
+        assert int(interval) == interval and interval > 0, \
+            "ControlRate.__init__, the interval shall be a positive integer"
+        assert interpolation in INTERPOLATIONS, f"ControlRate.__init__, interpolation shall be one of {INTERPOLATIONS}"
+        self.modulator = modulator
+        self.interval = int(interval)
+        self.interpolation = interpolation
+
+    def __call__(self, t):
+        """Outside of a time sample the control rate is unknown, the modulator itself is returned"""
+        return self.modulator(t)
+
+    def error_bound(self, frame_rate: float, max_derivative: float):
+        """
+            The maximum difference between the interpolated modulator and the modulator itself
+        :param frame_rate: the audio frame rate
+        :param max_derivative: a bound of the absolute value of the derivative of the modulator of order 2 (linear)
+            or 4 (cubic), e.g. `A * (2 pi f) ** 2` and `A * (2 pi f) ** 4` for a sine of amplitude A and frequency f
+        """
+        step = self.interval / frame_rate
+        order = 2 if self.interpolation == "linear" else 4
+        return self.error_factors[self.interpolation] * max_derivative * step ** order
+
+    def sample_array(self, time_sample):
+        if not len(time_sample):
+            return np.zeros(0)
+
+        control_rate = 1 / (self.interval * time_sample.frame_width)
+        positions = time_sample.to_array() * control_rate
+
+        # one more control point before and two after, for the cubic interpolation
+        first = floor(float(np.min(positions))) - 1
+        last = ceil(float(np.max(positions))) + 2
+        control = TimeSample.from_frames(first, last - first + 1, control_rate)
+        values = np.broadcast_to(sample_parameter(self.modulator, control), (len(control),))
+
+        return interpolate(values, positions - first, self.interpolation)
+
+    def __repr__(self):
+        return f"ControlRate({self.modulator!r}, {self.interval})"
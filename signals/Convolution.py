@@ -0,0 +1,65 @@
+from math import ceil, log2
+
+import numpy as np
+
+from .core.Filter import Filter
+
+
+class Convolution(Filter):
+    """
+        Convolution with a long impulse response (reverb, cabinet, ...) by FFT, with the overlap-add method
+        Each segment costs one FFT of twice the segment size, which is at least the size of the impulse response.
+    """
+
+    def __init__(self, signal, impulse_response, frame_rate: float = None, segment_size: int = None):
+        """
+        :param signal: the input of the filter
+        :param impulse_response: the impulse response, an array of frames (or a SignalSample)
+        :param frame_rate: the frame rate of the impulse response, if given renders at another frame rate are refused
+            (it is also the frame grid used when the filter is evaluated at a single time, 44100Hz by default)
+        :param segment_size: the number of frames filtered at once, by default the size of the impulse response
+            rounded up to a power of 2 (at least 4096)
+        """
+        if hasattr(impulse_response, 'time_sample'):
+            frame_rate = frame_rate or 1 / impulse_response.time_sample.frame_width
+            impulse_response = impulse_response.Y
+        super().__init__(signal, frame_rate or 44100.0)
+        self.impulse_response = np.asarray(impulse_response, dtype=float)
+        assert self.impulse_response.ndim == 1 and len(self.impulse_response), \
+            "Convolution.__init__, the impulse response shall be a non empty 1D array"
+        self.impulse_rate = frame_rate
+        self.segment_size = segment_size or max(Filter.segment_size, 2 ** ceil(log2(len(self.impulse_response))))
+        self._spectrum = None
+
+    def __getstate__(self):
+        return dict(super().__getstate__(), _spectrum=None)
+
+    @property
+    def fft_size(self):
+        return 2 ** ceil(log2(self.segment_size + len(self.impulse_response) - 1))
+
+    @property
+    def spectrum(self):
+        if self._spectrum is None:
+            self._spectrum = np.fft.rfft(self.impulse_response, self.fft_size)
+        return self._spectrum
+
+    def history(self, frame_width):
+        return len(self.impulse_response) - 1
+
+    def initial_state(self, frame_width):
+        if self.impulse_rate is not None:
+            assert abs(self.impulse_rate * frame_width - 1) < 1e-9, \
+                f"Convolution, the impulse response is sampled at {self.impulse_rate}Hz, not at {1 / frame_width}Hz"
+        # the tail of the previous segments, added to the next ones
+        return np.zeros(len(self.impulse_response) - 1)
+
+    def process(self, values, state, frame_width):
+        size = len(values)
+        convolved = np.fft.irfft(np.fft.rfft(values, self.fft_size) * self.spectrum, self.fft_size)
+        convolved = convolved[:size + len(state)]
+        convolved[:len(state)] += state
+        return convolved[:size], convolved[size:]
+
+    def __repr__(self):
+        return f"Convolution({self.signal!r}, {len(self.impulse_response)} frames)"
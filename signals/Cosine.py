@@ -1,4 +1,7 @@
 from math import cos, tau
+
+import numpy as np
+
 from .core import SimpleSignal
 from .core.utils import trig
 
@@ -64,7 +67,7 @@ class Cosine(SimpleSignal):
         n = time_sample.n_frames
 
         while 0 < n:
-            yield s0
+            yield c0
             if n <= 1:
                 return
             yield c0 * dc1 - s0 * ds1
@@ -95,3 +98,6 @@ class Cosine(SimpleSignal):
             c0, s0 = c0 * dc10 - s0 * ds10, c0 * ds10 + s0 * dc10
 
             n -= 10
+
+    def sample_array(self, time_sample):
+        return self.amplitude * np.cos(tau * self.frequency * time_sample.to_array() + self.phase)
@@ -1,4 +1,5 @@
-from .core import Signal
+from .core import Signal, sample_parameter
+from .core.support import intersection, support_of, support_between
 
 
 class Envelop(Signal):
@@ -14,5 +15,16 @@ class Envelop(Signal):
     def period(self):
         return 0
 
+    @property
+    def support(self):
+        return intersection(self.original_signal.support, support_of(self.amplitude_function))
+
+    def support_between(self, t_min, t_max):
+        return intersection(self.original_signal.support_between(t_min, t_max),
+                            support_between(self.amplitude_function, t_min, t_max))
+
     def __call__(self, t):
         return self.amplitude_function(t) * self.original_signal(t)
+
+    def sample_array(self, time_sample):
+        return sample_parameter(self.amplitude_function, time_sample) * self.original_signal.sample_array(time_sample)
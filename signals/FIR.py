@@ -0,0 +1,34 @@
+import numpy as np
+
+from .core.Filter import Filter
+
+
+class FIR(Filter):
+    """
+        Finite impulse response filter : y[n] = taps[0] * x[n] + taps[1] * x[n - 1] + ... (direct convolution)
+        For long impulse responses (reverbs, ...) use Convolution instead
+    """
+
+    def __init__(self, signal, taps, frame_rate: float = 44100.0):
+        """
+        :param signal: the input of the filter
+        :param taps: the coefficients of the filter (its impulse response, in frames)
+        :param frame_rate: the frame grid used when the filter is evaluated at a single time (see `Filter.__call__`)
+        """
+        super().__init__(signal, frame_rate)
+        self.taps = np.asarray(taps, dtype=float)
+        assert self.taps.ndim == 1 and len(self.taps), "FIR.__init__, taps shall be a non empty 1D array"
+
+    def history(self, frame_width):
+        return len(self.taps) - 1
+
+    def initial_state(self, frame_width):
+        # the last inputs of the previous segment
+        return np.zeros(len(self.taps) - 1)
+
+    def process(self, values, state, frame_width):
+        values = np.concatenate([state, values])
+        return np.convolve(values, self.taps, mode='valid'), values[len(values) - len(state):]
+
+    def __repr__(self):
+        return f"FIR({self.signal!r}, {len(self.taps)} taps)"
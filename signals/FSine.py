@@ -1,7 +1,12 @@
 from math import sin, tau
 from typing import Union
 
+import numpy as np
+
 from .core.Signal import Signal
+from .core.PhaseAccumulator import PhaseAccumulator
+from .core.TimeSample import TimeSample
+from .core.utils import sample_parameter
 
 
 class FSine(Signal):
@@ -10,13 +15,47 @@ class FSine(Signal):
     """
     allowed = Union[int, float, callable, Signal]
 
-    def __init__(self, frequency: allowed, amplitude: allowed = 1.0, phase: allowed = 0.0):
+    def __init__(self, frequency: allowed, amplitude: allowed = 1.0, phase: allowed = 0.0,
+                 frame_rate: float = 44100.0):
+        """
+        :param frequency: the frequency, a constant or a function of time (the instantaneous frequency)
+        :param amplitude: the amplitude, a constant or a function of time
+        :param phase: the phase, a constant or a function of time
+        :param frame_rate: the frame grid used when a time varying frequency is evaluated at a single time
+            (see `__call__`), `sample_array` uses the frames of the time sample
+        """
+        assert frame_rate > 0
         self.frequency = frequency
         self.amplitude = amplitude
         self.phase = phase
+        self.frame_rate = frame_rate
+        self._accumulator = PhaseAccumulator()
 
     def __call__(self, t):
-        frequency = self.frequency(t) if hasattr(self.frequency, '__call__') else self.frequency
+        """
+            The same value as `sample_array` : a time varying frequency is integrated up to the frame of `frame_rate`
+            holding t (consecutive frames continue the phase reached)
+        """
+        if hasattr(self.frequency, '__call__'):
+            return self.sample_array(TimeSample.from_frames(round(t * self.frame_rate), 1, self.frame_rate))[0]
+
         amplitude = self.amplitude(t) if hasattr(self.amplitude, '__call__') else self.amplitude
         phase = self.phase(t) if hasattr(self.phase, '__call__') else self.phase
-        return amplitude * sin(tau * frequency * t + phase)
+        return amplitude * sin(tau * self.frequency * t + phase)
+
+    def frequency_for(self, time_sample):
+        return sample_parameter(self.frequency, time_sample)
+
+    def sample_array(self, time_sample):
+        """
+            A time varying frequency is integrated with a phase accumulator (so it is the instantaneous frequency),
+            `__call__` gives the same values
+        """
+        frequency = self.frequency_for(time_sample)
+        if np.ndim(frequency) == 0:
+            phase = tau * frequency * time_sample.to_array()
+        else:
+            phase = self._accumulator(time_sample, self.frequency_for, frequency)
+
+        amplitude = sample_parameter(self.amplitude, time_sample)
+        return amplitude * np.sin(phase + sample_parameter(self.phase, time_sample))
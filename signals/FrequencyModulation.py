@@ -1,25 +1,44 @@
 from signals.core import Signal
 from signals.Sine import Sine
-from math import sin, tau
+from signals.core.PhaseAccumulator import PhaseAccumulator
+from signals.core.TimeSample import TimeSample
+
+import numpy as np
 
 __author__ = "Elie Grinfeder"
 __version__ = "1.0"
 
 
 class FrequencyModulation(Signal):
-    def __init__(self, carrier: Sine, carried: Signal, depth: float = 1):
+    def __init__(self, carrier: Sine, carried: Signal, depth: float = 1, frame_rate: float = 44100.0):
         """
             Create a frequency modulated signal
             :param carrier: carrier wave
             :param carried: carried wave
             :param depth: modulation factor
+            :param frame_rate: the frame grid used when the signal is evaluated at a single time (see `__call__`)
         """
+        assert frame_rate > 0
         self.carrier = carrier  # xp = Ap sin(wp * t)
         self.carried = carried  # xm = Am sin(wm * t)
         self.depth = depth
+        self.frame_rate = frame_rate
+        self._accumulator = PhaseAccumulator()
 
     def __call__(self, t):
-        amplitude = self.carrier.amplitude
-        frequency = self.carrier.frequency + self.depth * self.carried(t)
-        phase = self.carrier.phase
-        return amplitude * sin(tau * frequency * t + phase)
+        """
+            The same value as `sample_array` : the frequency is integrated up to the frame of `frame_rate` holding t
+            (consecutive frames continue the phase reached)
+        """
+        return self.sample_array(TimeSample.from_frames(round(t * self.frame_rate), 1, self.frame_rate))[0]
+
+    def frequency_for(self, time_sample):
+        return self.carrier.frequency + self.depth * self.carried.sample_array(time_sample)
+
+    def sample_array(self, time_sample):
+        """
+            The instantaneous frequency `carrier.frequency + depth * carried(t)` is integrated with a phase accumulator,
+            which is the true frequency modulation
+        """
+        phase = self._accumulator(time_sample, self.frequency_for)
+        return self.carrier.amplitude * np.sin(phase + self.carrier.phase)
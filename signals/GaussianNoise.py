@@ -1,19 +1,27 @@
-from random import gauss
 from .core import Signal
+from .core.noise import new_seed, first_frame, random_values
 
 
 class GaussianNoise(Signal):
-    def __init__(self, amplitude, mu, sigma):
+    def __init__(self, amplitude, mu, sigma, seed: int = None, frame_rate: float = 44100.0):
         self.amplitude = amplitude
         self.mu = mu
         self.sigma = sigma
+        self.seed = new_seed() if seed is None else seed
+        self.frame_rate = frame_rate
 
     @property
     def period(self):
         return 0
 
     def __call__(self, t):
-        return self.amplitude * gauss(self.mu, self.sigma)
+        """The value of the frame of `frame_rate` holding t (the same as `sample_array` at that frame rate)"""
+        normal = random_values(self.seed, round(t * self.frame_rate), 1, "normal")[0]
+        return self.amplitude * (self.mu + self.sigma * normal)
+
+    def sample_array(self, time_sample):
+        normal = random_values(self.seed, first_frame(time_sample), len(time_sample), "normal")
+        return self.amplitude * (self.mu + self.sigma * normal)
 
     def __repr__(self):
         return f"{self.amplitude} * Gauss({self.mu}, {self.sigma})"
@@ -1,4 +1,5 @@
 from .core import PeriodicSignal, SignalSum
+from .core.OscillatorBank import OscillatorBank
 from .Sine import Sine
 
 
@@ -22,6 +23,12 @@ class HarmonicSerie(PeriodicSignal):
 
         self.signal = SignalSum(self.fundamental, *self.harmonics)
 
+        self.bank = OscillatorBank(
+            base_frequency=self.base_frequency,
+            amplitudes=[sine.amplitude for sine in self.signal.signals],
+            phases=[sine.phase for sine in self.signal.signals]
+        )
+
     @property
     def period(self):
         """The period of an harmonic serie is the period of the fundamental sine"""
@@ -30,6 +37,14 @@ class HarmonicSerie(PeriodicSignal):
     def __call__(self, t):
         return self.signal(t)
 
+    def structure(self):
+        """Everything derives from the sum of sines (the harmonics functions are only used to build it)"""
+        return dict(signal=self.signal)
+
+    def sample_array(self, time_sample):
+        """Render all the partials together (the ones above the Nyquist frequency are dropped)"""
+        return self.bank.render(time_sample)
+
     def __repr__(self):
         return repr(self.signal)
 
@@ -0,0 +1,75 @@
+from math import floor, ceil
+
+import numpy as np
+
+from .core import Signal
+from .core.wavefile import WaveData
+from .core.utils import interpolate, INTERPOLATIONS
+
+
+class SampledSignal(Signal):
+    """
+        Play recorded frames (a wave file or an array) back as a signal, the signal is 0 outside of the recording
+        Only the frames needed by a render are read (and decoded), so long memory mapped files cost no memory.
+    """
+
+    def __init__(self, data, frame_rate: float = None, rate: float = 1.0, offset: float = 0.0, amplitude: float = 1.0,
+                 interpolation: str = "linear", channel: int = None):
+        """
+        :param data: a WaveData, or an array of float frames (1D, or 2D of shape (n_frames, n_channels))
+        :param frame_rate: the frame rate of the data, required for arrays
+        :param rate: the playback speed, 2.0 plays the recording twice as fast (one octave higher)
+        :param offset: the time (in seconds) at which the recording starts
+        :param amplitude: a factor applied to the recording
+        :param interpolation: "linear" or "cubic"
+        :param channel: the channel to play, by default the mean of all the channels
+        """
+        if not isinstance(data, WaveData):
+            assert frame_rate, "SampledSignal.__init__, the frame_rate is required when the data is an array"
+            data = WaveData(np.asarray(data), frame_rate)
+        assert rate > 0
+        assert interpolation in INTERPOLATIONS, \
+            f"SampledSignal.__init__, interpolation shall be one of {INTERPOLATIONS}"
+        self.data = data
+        self.rate = rate
+        self.offset = offset
+        self.amplitude = amplitude
+        self.interpolation = interpolation
+        self.channel = channel
+
+    @classmethod
+    def from_wave(cls, filepath, **config):
+        """Memory map a wave file and play it back (see `__init__` for the config)"""
+        return cls(WaveData.from_file(filepath), **config)
+
+    @property
+    def duration(self):
+        return self.data.duration / self.rate
+
+    @property
+    def support(self):
+        # the interpolation reaches 2 frames of the data before and after the recording
+        margin = 2 / (self.rate * self.data.framerate)
+        return [(self.offset - margin, self.offset + self.duration + margin)]
+
+    def positions(self, t):
+        """The (fractional) frame indexes of the data played at the times t"""
+        return (t - self.offset) * (self.rate * self.data.framerate)
+
+    def read(self, positions):
+        """Interpolate the data at the positions, only decoding the frames around them"""
+        start = floor(float(np.min(positions))) - 1
+        stop = ceil(float(np.max(positions))) + 3
+        values = self.data.read(start, stop, self.channel)
+        return self.amplitude * interpolate(values, positions - start, self.interpolation)
+
+    def __call__(self, t):
+        return float(self.read(np.array([self.positions(t)]))[0])
+
+    def sample_array(self, time_sample):
+        if not len(time_sample):
+            return np.zeros(0)
+        return self.read(self.positions(time_sample.to_array()))
+
+    def __repr__(self):
+        return f"SampledSignal({len(self.data)} frames at {self.data.framerate}Hz, rate={self.rate})"
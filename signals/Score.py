@@ -0,0 +1,108 @@
+from math import floor
+
+import numpy as np
+
+from .core import Signal
+from .core.TimeSample import TimeSample
+from .core.noise import first_frame
+from .core.support import normalize
+
+
+class Score(Signal):
+    """
+        Mix of timed notes, each note being a signal played from `start` for `duration` seconds
+        A note signal is played in its own time : it is evaluated at `t - start`, so the same note can be reused.
+        The notes are indexed by buckets of `bucket` seconds, so rendering a block only costs the notes sounding in it
+        (the cost follows the polyphony, not the number of notes of the score).
+        A note is silent outside of its span, its `duration` must include its release.
+    """
+
+    def __init__(self, notes=(), bucket: float = 1.0):
+        """
+        :param notes: (start, duration, signal) or (start, duration, signal, gain) tuples
+        :param bucket: the time span (in seconds) of the buckets indexing the notes
+        """
+        assert bucket > 0
+        self.bucket = bucket
+        self.notes = []
+        self._index = {}
+        self._support = None
+        for note in notes:
+            self.add(*note)
+
+    def add(self, start: float, duration: float, signal, gain: float = 1.0):
+        """Add a note played from `start` (in seconds) for `duration` seconds, return the score"""
+        assert duration >= 0
+        assert isinstance(signal, Signal)
+        position = len(self.notes)
+        self.notes.append((start, duration, signal, gain))
+        for key in range(floor(start / self.bucket), floor((start + duration) / self.bucket) + 1):
+            self._index.setdefault(key, []).append(position)
+        self._support = None
+        return self
+
+    def __getstate__(self):
+        # the support is rebuilt on demand
+        return dict(vars(self), _support=None)
+
+    def __len__(self):
+        return len(self.notes)
+
+    @property
+    def duration(self):
+        """The end of the last note"""
+        return max((start + duration for start, duration, _, _ in self.notes), default=0.0)
+
+    @property
+    def support(self):
+        if self._support is None:
+            self._support = normalize((start, start + duration) for start, duration, _, _ in self.notes)
+        return self._support
+
+    def support_between(self, t_min, t_max):
+        """The spans of the notes sounding in [t_min, t_max], found with the index"""
+        return normalize((self.notes[position][0], self.notes[position][0] + self.notes[position][1])
+                         for position in self.active_notes(t_min, t_max))
+
+    def active_notes(self, t_min: float, t_max: float):
+        """Return the positions (in the order they were added) of the notes sounding at some time of [t_min, t_max]"""
+        positions = set()
+        for key in range(floor(t_min / self.bucket), floor(t_max / self.bucket) + 1):
+            positions.update(self._index.get(key, ()))
+
+        result = []
+        for position in sorted(positions):
+            start, duration, _, _ = self.notes[position]
+            if start <= t_max and t_min < start + duration:
+                result.append(position)
+        return result
+
+    def __call__(self, t):
+        result = 0.0
+        for position in self.active_notes(t, t):
+            start, duration, signal, gain = self.notes[position]
+            result += gain * signal(t - start)
+        return result
+
+    def sample_array(self, time_sample):
+        result = np.zeros(len(time_sample))
+        if not len(time_sample):
+            return result
+
+        times = time_sample.to_array()
+        first = first_frame(time_sample)
+        for position in self.active_notes(times[0], times[-1]):
+            start, duration, signal, gain = self.notes[position]
+            i_start, i_stop = np.searchsorted(times, [start, start + duration])
+            if i_start == i_stop:
+                continue
+            # the note is rendered on the frames of the score grid, expressed in its own time
+            local = TimeSample.from_frames(first + i_start, i_stop - i_start, time_sample.frame_rate, t_origin=-start)
+            values = signal.sample_array(local)
+            if gain != 1.0:
+                values = values * gain
+            result[i_start:i_stop] += values
+        return result
+
+    def __repr__(self):
+        return f"Score({len(self.notes)} notes, {self.duration:.3g}s)"
@@ -1,4 +1,7 @@
 from math import sin, tau
+
+import numpy as np
+
 from .core import SimpleSignal
 from .core.utils import trig
 
@@ -95,3 +98,6 @@ class Sine(SimpleSignal):
             c0, s0 = c0 * dc10 - s0 * ds10, c0 * ds10 + s0 * dc10
 
             n -= 10
+
+    def sample_array(self, time_sample):
+        return self.amplitude * np.sin(tau * self.frequency * time_sample.to_array() + self.phase)
@@ -0,0 +1,81 @@
+import weakref
+from collections import OrderedDict
+from math import tau
+
+import numpy as np
+
+from .core import PeriodicSignal, SimpleSignal, sample_function
+from .core.TimeSample import TimeSample
+from .core.utils import interpolate_periodic, INTERPOLATIONS
+
+
+class Wavetable(SimpleSignal):
+    """
+        Play one pre-rendered period of a source back at any frequency
+        The tables are cached per source (see `Wavetable.cache_size`), call `Wavetable.clear_cache` after modifying a source
+    """
+    cache_size = 4
+    _tables = weakref.WeakKeyDictionary()
+
+    def __init__(self, source, frequency: float = None, amplitude: float = 1.0, phase: float = 0.0,
+                 size: int = 2048, interpolation: str = "linear"):
+        """
+        :param source: a periodic signal (one period is rendered) or a callable of the position in the period, in [0, 1)
+        :param frequency: the playback frequency, by default the frequency of the source
+        :param amplitude: a factor applied to the table
+        :param phase: expressed in radians
+        :param size: the number of points in the table
+        :param interpolation: "linear" or "cubic"
+        """
+        if frequency is None:
+            assert isinstance(source, PeriodicSignal) and source.period, \
+                "Wavetable.__init__, the frequency is required when the source is not a periodic signal"
+            frequency = 1 / source.period
+        super().__init__(frequency)
+        assert size > 0
+        assert interpolation in INTERPOLATIONS, f"Wavetable.__init__, interpolation shall be one of {INTERPOLATIONS}"
+        self.source = source
+        self.amplitude = amplitude
+        self.phase = phase
+        self.size = size
+        self.interpolation = interpolation
+
+    @classmethod
+    def clear_cache(cls):
+        cls._tables.clear()
+
+    @staticmethod
+    def render_table(source, size):
+        if isinstance(source, PeriodicSignal) and source.period:
+            time_sample = TimeSample(t_min=0, n_frames=size, frame_rate=size / source.period)
+        else:
+            time_sample = TimeSample(t_min=0, n_frames=size, frame_rate=size)
+        return sample_function(source, time_sample)
+
+    @property
+    def table(self):
+        try:
+            tables = self._tables.setdefault(self.source, OrderedDict())
+        except TypeError:
+            # the source can't be weakly referenced, so it can't be cached
+            return self.render_table(self.source, self.size)
+
+        if self.size in tables:
+            tables.move_to_end(self.size)
+        else:
+            tables[self.size] = self.render_table(self.source, self.size)
+            while len(tables) > self.cache_size:
+                tables.popitem(last=False)
+        return tables[self.size]
+
+    def positions(self, times):
+        return (self.frequency * times + self.phase / tau) * self.size
+
+    def __call__(self, t):
+        return self.amplitude * float(interpolate_periodic(self.table, self.positions(np.array([t])), self.interpolation)[0])
+
+    def sample_array(self, time_sample):
+        return self.amplitude * interpolate_periodic(self.table, self.positions(time_sample.to_array()), self.interpolation)
+
+    def __repr__(self):
+        return f"Wavetable({self.source!r}, {self.frequency})"
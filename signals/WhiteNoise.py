@@ -1,26 +1,32 @@
 from math import fabs as abs
-from random import uniform
+
 from .core import Signal
+from .core.noise import new_seed, first_frame, random_values
 
 
 class WhiteNoise(Signal):
-    def __init__(self, amplitude: float):
+    def __init__(self, amplitude: float, seed: int = None, frame_rate: float = 44100.0):
         """
             Create white noise for a random uniform distribution law between [-amplitude, +amplitude]
         :param amplitude: The maximum amplitude of the signal
+        :param seed: The seed of the noise, for a given seed `sample_array` always gives the same values for the same frames
+        :param frame_rate: The frame grid used when the noise is evaluated at a single time (see `__call__`),
+            `sample_array` uses the frames of the time sample
         """
         self.amplitude = abs(amplitude)
+        self.seed = new_seed() if seed is None else seed
+        self.frame_rate = frame_rate
 
     @property
     def period(self):
         return 0
 
     def __call__(self, t):
-        """
-            See Signal.__call__ docstring
-            >>> help(Signal.__init__)
-        """
-        return self.amplitude * uniform(-1, 1)
+        """The value of the frame of `frame_rate` holding t (the same as `sample_array` at that frame rate)"""
+        return self.amplitude * random_values(self.seed, round(t * self.frame_rate), 1, "uniform")[0]
+
+    def sample_array(self, time_sample):
+        return self.amplitude * random_values(self.seed, first_frame(time_sample), len(time_sample), "uniform")
 
     def __repr__(self):
         """Displays the white noise equation (where U is used as an abbreviation for random uniform distribution)"""
@@ -2,17 +2,27 @@
 from .core import *
 from .GaussianNoise import GaussianNoise
 from .WhiteNoise import WhiteNoise
+from .ColoredNoise import ColoredNoise
 from .Sine import Sine
 from .Cosine import Cosine
 from .FSine import FSine
 from .FCosine import FCosine
 from .HarmonicSerie import HarmonicSerie
 from .Envelop import Envelop
+from .Breakpoints import Breakpoints
+from .ADSR import ADSR
 from .AmplitudeModulation import AmplitudeModulation
 from .FrequencyModulation import FrequencyModulation
 from .Click import Click
 from .ClickTrain import ClickTrain
 from .FunctionSignal import FunctionSignal
+from .Wavetable import Wavetable
+from .SampledSignal import SampledSignal
+from .ControlRate import ControlRate
+from .Score import Score
+from .Biquad import Biquad
+from .FIR import FIR
+from .Convolution import Convolution
 
 # metadata
 __author__ = "Gabriel Amare"
@@ -26,17 +36,27 @@ SoundSynthesis is a little package made to create sound signals from various typ
 Here is the different types of signal already implemented in the package :
     - GaussianNoise
     - WhiteNoise
+    - ColoredNoise
     - Sine
     - Cosine
     - FSine
     - FCosine
     - HarmonicSerie
     - Envelop
+    - Breakpoints
+    - ADSR
     - AmplitudeModulation
     - FrequencyModulation
     - Click
     - ClickTrain
     - FunctionSignal
+    - Wavetable
+    - SampledSignal
+    - ControlRate
+    - Score
+    - Biquad
+    - FIR
+    - Convolution
 """
 __classifiers__ = [
     "Topic :: Multimedia :: Sound/Audio :: Sound Synthesis"
@@ -0,0 +1,114 @@
+from math import floor, ceil
+
+import numpy as np
+
+from .Signal import Signal
+from .TimeSample import TimeSample
+from .noise import first_frame
+from .support import sample_supported
+
+
+class Filter(Signal):
+    """
+        Base of the filters : signals transforming the values of another signal, keeping a state from frame to frame
+        The input is processed by segments of `segment_size` frames aligned on the grid of frames starting at t=0,
+        the input being sampled over whole segments even when only a part of one is rendered. So the output doesn't
+        depend on how the render is split : one pass, blocks (streaming, playback) or parallel segments.
+        The state reached at the end of a render is kept, so consecutive blocks continue where the previous one stopped.
+        Any other start (first render, seek, parallel segment) filters the input from t=0, where the filter is at rest
+        (or from the first rendered segment, when it is before t=0), unless the filter only depends on a finite history
+        of its input (see `history`) : then the filtering starts at the segment holding that history.
+        Filters depending on their whole past keep their state every `checkpoint_segments` segments, a seek starts from
+        the last checkpoint before it. They are rendered in a single process (see `parallel_sample_array`).
+        Subclasses define `initial_state` and `process`.
+    """
+    segment_size = 4096
+    checkpoint_segments = 16
+
+    def __init__(self, signal: Signal, frame_rate: float = 44100.0):
+        """
+        :param signal: the input of the filter
+        :param frame_rate: the frame grid used when the filter is evaluated at a single time (see `__call__`),
+            `sample_array` uses the frames of the time sample
+        """
+        assert isinstance(signal, Signal)
+        assert frame_rate > 0
+        self.signal = signal
+        self.frame_rate = frame_rate
+        self._state = None
+        # (t_origin, frame_width) -> {segment: the state at its start}
+        self._checkpoints = {}
+
+    def __getstate__(self):
+        # the states are only valid in the process which rendered them
+        return dict(vars(self), _state=None, _checkpoints={})
+
+    def initial_state(self, frame_width):
+        """The state of the filter at rest"""
+        raise NotImplementedError
+
+    def history(self, frame_width):
+        """
+            The number of past input frames the output depends on, None if it depends on the whole past (IIR filters)
+        """
+        return None
+
+    def process(self, values, state, frame_width):
+        """
+            Filter one segment of the input
+        :param values: the input over the segment, as a numpy array
+        :param state: the state reached at the end of the previous segment
+        :param frame_width: the duration of a frame (in seconds)
+        :return: the output over the segment and the state at its end
+        """
+        raise NotImplementedError
+
+    def __call__(self, t):
+        """The output at the frame of `frame_rate` holding t (consecutive frames continue the state of the filter)"""
+        return self.sample_array(TimeSample.from_frames(round(t * self.frame_rate), 1, self.frame_rate))[0]
+
+    def i_sample_data(self, time_sample):
+        yield from self.sample_array(time_sample)
+
+    def sample_array(self, time_sample):
+        if not len(time_sample):
+            return np.zeros(0)
+
+        size = self.segment_size
+        frame_width = time_sample.frame_width
+        first = first_frame(time_sample)
+        first_segment = floor(first / size)
+        last_segment = ceil((first + len(time_sample)) / size)
+        key = (time_sample.t_origin, frame_width)
+        history = self.history(frame_width)
+        checkpoints = self._checkpoints.setdefault(key, {}) if history is None else {}
+
+        outputs = []
+        state = self._state
+        if state is not None and state[0] == key and state[1] == first_segment:
+            segment, filter_state = first_segment, state[2]
+        elif state is not None and state[0] == key and state[1] == first_segment + 1:
+            # the first segment was the last one rendered
+            segment, filter_state = first_segment + 1, state[2]
+            outputs.append(state[3])
+        elif history is not None:
+            segment = floor((first - history) / size)
+            filter_state = self.initial_state(frame_width)
+        else:
+            known = [segment for segment in checkpoints if segment <= first_segment]
+            segment = max(known) if known else min(0, first_segment)
+            filter_state = checkpoints[segment] if known else self.initial_state(frame_width)
+
+        last_output = state[3] if outputs else None
+        for segment in range(segment, last_segment):
+            if history is None and segment % self.checkpoint_segments == 0:
+                checkpoints.setdefault(segment, filter_state)
+            start = segment * size - first
+            values = sample_supported(self.signal, time_sample.grid(start, start + size))
+            last_output, filter_state = self.process(values, filter_state, frame_width)
+            if segment >= first_segment:
+                outputs.append(last_output)
+
+        self._state = (key, last_segment, filter_state, last_output)
+        offset = first - first_segment * size
+        return np.concatenate(outputs)[offset:offset + len(time_sample)]
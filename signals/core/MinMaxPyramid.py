@@ -0,0 +1,79 @@
+from math import ceil, floor, log2
+
+import numpy as np
+
+
+class MinMaxPyramid:
+    """
+        Minimum and maximum of a sample over buckets of frames, at several resolutions
+        The level k holds the extrema of the buckets of `base * 2 ** k` frames, the bucket i covering the frames
+        `i * size` to `(i + 1) * size`. It gives the envelope of any range of frames at about any number of points,
+        keeping the peaks visible, without going through the frames again.
+    """
+
+    def __init__(self, data, base: int = 16, chunk: int = 2 ** 16):
+        """
+        :param data: the samples, 1D or 2D of shape (n_frames, n_channels), read `chunk` buckets at a time
+        :param base: the number of frames of the buckets of the first level
+        :param chunk: the number of buckets computed at once
+        """
+        assert base > 0 and chunk > 0
+        self.base = base
+        self.length = len(data)
+
+        mins, maxs = [], []
+        for start in range(0, len(data), base * chunk):
+            block = np.asarray(data[start:start + base * chunk], dtype=float)
+            full = len(block) // base * base
+            if full:
+                buckets = block[:full].reshape(-1, base, *block.shape[1:])
+                mins.append(buckets.min(axis=1))
+                maxs.append(buckets.max(axis=1))
+            if full < len(block):
+                mins.append(block[full:].min(axis=0, keepdims=True))
+                maxs.append(block[full:].max(axis=0, keepdims=True))
+
+        if not mins:
+            mins = maxs = [np.zeros((0, *np.shape(data)[1:]))]
+        self.mins = [np.concatenate(mins)]
+        self.maxs = [np.concatenate(maxs)]
+
+        while len(self.mins[-1]) > 1:
+            self.mins.append(self.pairs(self.mins[-1], np.minimum))
+            self.maxs.append(self.pairs(self.maxs[-1], np.maximum))
+
+    @staticmethod
+    def pairs(values, function):
+        if len(values) % 2:
+            values = np.concatenate([values, values[-1:]])
+        return function(values[0::2], values[1::2])
+
+    def bucket_size(self, level):
+        return self.base * 2 ** level
+
+    def envelope(self, start: int, stop: int, buckets: int):
+        """
+            The extrema of the frames `start` to `stop` over at most `buckets` buckets
+        :return: the index of the first frame of each bucket, the size of the buckets (in frames), the minimums
+            and the maximums. The buckets at the ends can go a little beyond the range.
+        """
+        start, stop = max(0, start), min(self.length, stop)
+        assert buckets > 0
+        if stop <= start:
+            empty = self.mins[0][:0]
+            return np.zeros(0, dtype=int), self.base, empty, empty
+
+        wanted = (stop - start) / buckets
+        level = min(max(0, floor(log2(max(wanted / self.base, 1)))), len(self.mins) - 1)
+        size = self.bucket_size(level)
+
+        first, last = start // size, ceil(stop / size)
+        mins, maxs = self.mins[level][first:last], self.maxs[level][first:last]
+
+        factor = ceil(len(mins) / buckets)
+        indexes = np.arange(0, len(mins), factor)
+        if factor > 1:
+            mins = np.minimum.reduceat(mins, indexes, axis=0)
+            maxs = np.maximum.reduceat(maxs, indexes, axis=0)
+
+        return (first + indexes) * size, size * factor, mins, maxs
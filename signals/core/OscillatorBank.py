@@ -0,0 +1,64 @@
+from math import tau
+
+import numpy as np
+
+from .utils import interpolate_periodic
+
+
+class OscillatorBank:
+    """
+        Render a sum of harmonic partials   S(t) = sum_k a_k * sin(2 pi k f t + p_k)   [k = 1 .. number of partials]
+        Partials at or above the Nyquist frequency of the time sample are dropped.
+        Few partials are rendered directly, otherwise one period of the sum is built with an inverse FFT
+        and read back with cubic interpolation, so the cost per frame doesn't depend on the number of partials.
+    """
+    direct_max_partials = 4
+    oversampling = 32
+    min_table_size = 1024
+
+    def __init__(self, base_frequency, amplitudes, phases):
+        """
+        :param base_frequency: the frequency of the first partial
+        :param amplitudes: the amplitude of each partial (starting from the first one)
+        :param phases: the phase of each partial (starting from the first one)
+        """
+        assert len(amplitudes) == len(phases)
+        self.base_frequency = base_frequency
+        self.amplitudes = np.asarray(amplitudes, dtype=float)
+        self.phases = np.asarray(phases, dtype=float)
+        self._tables = {}
+
+    def __getstate__(self):
+        # the tables are rebuilt on demand
+        return dict(vars(self), _tables={})
+
+    def n_partials_for(self, time_sample):
+        """Number of partials strictly below the Nyquist frequency of the time sample"""
+        nyquist = 0.5 / time_sample.frame_width
+        n = int(np.ceil(nyquist / abs(self.base_frequency))) - 1
+        return max(0, min(len(self.amplitudes), n))
+
+    def table(self, n_partials):
+        """One period of the sum of the `n_partials` first partials"""
+        if n_partials not in self._tables:
+            size = max(self.min_table_size, 1 << int(np.ceil(np.log2(self.oversampling * n_partials))))
+            spectrum = np.zeros(size // 2 + 1, dtype=complex)
+            # sin(x + p) = Re(exp(i (x + p - pi / 2)))
+            spectrum[1:n_partials + 1] = (size / 2) * self.amplitudes[:n_partials] * \
+                                         np.exp(1j * (self.phases[:n_partials] - tau / 4))
+            self._tables[n_partials] = np.fft.irfft(spectrum, size)
+        return self._tables[n_partials]
+
+    def render(self, time_sample):
+        n_partials = self.n_partials_for(time_sample)
+        times = time_sample.to_array()
+
+        if n_partials <= self.direct_max_partials:
+            result = np.zeros(len(time_sample))
+            for k in range(n_partials):
+                result += self.amplitudes[k] * np.sin(tau * (k + 1) * self.base_frequency * times + self.phases[k])
+            return result
+
+        table = self.table(n_partials)
+        positions = np.mod(self.base_frequency * times, 1.0) * len(table)
+        return interpolate_periodic(table, positions, "cubic")
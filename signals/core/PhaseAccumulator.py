@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from math import tau
+
+import numpy as np
+
+from .TimeSample import TimeSample
+from .noise import first_frame
+
+
+class PhaseAccumulator:
+    """
+        Integrate a time varying frequency into a phase (in radians) on the grid of frames starting at t=0 :
+            phase[n] = 2 pi * frame_width * (f[0] + f[1] + ... + f[n - 1])
+        The phases reached at the end of the last renders are kept, so consecutive blocks continue exactly where
+        the previous one stopped, even when several renders are interleaved (a signal used by overlapping notes, ...).
+        The phase is also kept every `checkpoint_interval` frames, any other start (seek, parallel segment) integrates
+        the frequency from the nearest known phase (frame 0 at first).
+    """
+    checkpoint_interval = 65536
+    max_continuations = 16
+
+    def __init__(self):
+        # frame_width -> {frame: phase}
+        self.continuations = {}
+        self.checkpoints = {}
+
+    def __getstate__(self):
+        # the phases reached are only valid in the process which rendered them
+        return dict(vars(self), continuations={}, checkpoints={})
+
+    def integrate(self, frequency_for, frame_width, start, stop):
+        """2 pi * frame_width * (f[start] + ... + f[stop - 1])"""
+        time_sample = TimeSample(t_min=start * frame_width, n_frames=stop - start, frame_rate=1 / frame_width)
+        return tau * frame_width * np.sum(np.broadcast_to(frequency_for(time_sample), len(time_sample)))
+
+    def walk(self, frequency_for, frame_width, frame, phase, target):
+        """The phase at the frame `target` from the `phase` at `frame`, keeping the checkpoints met on the way"""
+        step = self.checkpoint_interval
+        checkpoints = self.checkpoints.setdefault(frame_width, {})
+        while frame != target:
+            if target > frame:
+                stop = min(target, (frame // step + 1) * step)
+                phase = (phase + self.integrate(frequency_for, frame_width, frame, stop)) % tau
+            else:
+                stop = max(target, (frame - 1) // step * step)
+                phase = (phase - self.integrate(frequency_for, frame_width, stop, frame)) % tau
+            frame = stop
+            if frame % step == 0:
+                checkpoints[frame] = phase
+        return phase
+
+    def start_phase(self, frequency_for, frame_width, first):
+        continuations = self.continuations.setdefault(frame_width, OrderedDict())
+        if first in continuations:
+            continuations.move_to_end(first)
+            return continuations[first]
+
+        known = {0: 0.0, **self.checkpoints.get(frame_width, {}), **continuations}
+        frame = min(known, key=lambda frame: abs(frame - first))
+        return self.walk(frequency_for, frame_width, frame, known[frame], first)
+
+    def __call__(self, time_sample, frequency_for, frequency=None):
+        """
+        :param time_sample: the TimeSample to compute the phase on
+        :param frequency_for: a function returning the frequency (array or constant) over a given TimeSample
+        :param frequency: the frequency over the time sample, if it has already been computed
+        :return: the phase at each frame of the time sample as a numpy array
+        """
+        frame_width = time_sample.frame_width
+        first = first_frame(time_sample)
+        start = self.start_phase(frequency_for, frame_width, first)
+
+        if frequency is None:
+            frequency = frequency_for(time_sample)
+        frequency = np.broadcast_to(frequency, len(time_sample))
+        increments = np.cumsum(frequency) * (tau * frame_width)
+        phases = np.empty(len(time_sample))
+        phases[:1] = start
+        phases[1:] = start + increments[:-1]
+
+        end = first + len(time_sample)
+        step = self.checkpoint_interval
+        checkpoints = self.checkpoints.setdefault(frame_width, {})
+        for frame in range(-(-first // step) * step, end, step):
+            checkpoints.setdefault(frame, phases[frame - first] % tau)
+
+        continuations = self.continuations[frame_width]
+        continuations[end] = (start + (increments[-1] if len(increments) else 0.0)) % tau
+        continuations.move_to_end(end)
+        if len(continuations) > self.max_continuations:
+            continuations.popitem(last=False)
+        return phases
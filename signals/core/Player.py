@@ -0,0 +1,179 @@
+import threading
+import time
+
+import numpy as np
+
+from .streaming import BlockLimiter
+
+
+class RingBuffer:
+    """Fixed capacity buffer of frames shared by one writer thread and one reader thread"""
+
+    def __init__(self, capacity: int):
+        assert capacity > 0
+        self.data = np.zeros(capacity)
+        self.capacity = capacity
+        self.start = 0
+        self.size = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def __len__(self):
+        return self.size
+
+    def write(self, block):
+        """Append the block, waiting for room when the buffer is full (returns False if the buffer was closed)"""
+        block = np.asarray(block, dtype=float)
+        written = 0
+        with self.condition:
+            while written < len(block):
+                while self.size == self.capacity and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return False
+                count = min(len(block) - written, self.capacity - self.size)
+                end = (self.start + self.size) % self.capacity
+                first = min(count, self.capacity - end)
+                self.data[end:end + first] = block[written:written + first]
+                self.data[:count - first] = block[written + first:written + count]
+                self.size += count
+                written += count
+                self.condition.notify_all()
+        return True
+
+    def read(self, n_frames: int, timeout: float = None):
+        """Return up to `n_frames` frames, waiting at most `timeout` seconds for them to be available"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.size >= n_frames or self.closed, timeout=timeout)
+            count = min(n_frames, self.size)
+            indexes = (self.start + np.arange(count)) % self.capacity
+            block = self.data[indexes]
+            self.start = (self.start + count) % self.capacity
+            self.size -= count
+            self.condition.notify_all()
+            return block
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class Player:
+    """
+        Real-time playback of a signal
+        A producer thread renders the signal block by block into a ring buffer, the sink is fed from the ring buffer.
+        When a block isn't rendered in time, silence is sent instead and an underrun is counted.
+    """
+
+    def __init__(self, signal, time_sample, sink, block_size: int = 1024, buffer_blocks: int = 8, gain: float = 1.0,
+                 norm_to: float = None):
+        """
+        :param signal: the signal to play
+        :param time_sample: the TimeSample to play the signal on
+        :param sink: where the audio goes (see the `sinks` module)
+        :param block_size: the number of frames rendered and sent to the sink at once
+        :param buffer_blocks: the capacity of the ring buffer, in blocks
+        :param gain: a factor applied to the signal
+        :param norm_to: if given, the gain is lowered on the fly by a BlockLimiter so that the output doesn't exceed
+            `norm_to` (see `streaming.BlockLimiter`)
+        """
+        self.signal = signal
+        self.time_sample = time_sample
+        self.sink = sink
+        self.block_size = block_size
+        self.gain = gain
+        self.limiter = BlockLimiter(norm_to, gain) if norm_to is not None else None
+        self.ring = RingBuffer(block_size * buffer_blocks)
+
+        self.rendered_frames = 0
+        self.played_frames = 0
+        self.underruns = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.startup_latency = None
+
+        self.producer = None
+        self.consumer = None
+        self.rendered = threading.Event()
+        self.stopped = threading.Event()
+        self.error = None
+
+    @property
+    def stats(self):
+        return dict(rendered_frames=self.rendered_frames, played_frames=self.played_frames, underruns=self.underruns,
+                    latency=self.latency, max_latency=self.max_latency, startup_latency=self.startup_latency)
+
+    def produce(self):
+        try:
+            for block in self.signal.i_sample_blocks(self.time_sample, self.block_size):
+                gain = self.limiter(block) if self.limiter else self.gain
+                if self.stopped.is_set() or not self.ring.write(block * gain):
+                    break
+                self.rendered_frames += len(block)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.rendered.set()
+            self.ring.close()
+
+    def consume(self):
+        frame_rate = 1 / self.time_sample.frame_width
+        budget = self.block_size / frame_rate
+        started = time.perf_counter()
+        try:
+            self.sink.open(frame_rate)
+            try:
+                while not self.stopped.is_set():
+                    block = self.ring.read(self.block_size, timeout=budget)
+                    finished = self.rendered.is_set() and not len(self.ring)
+
+                    if not len(block) and finished:
+                        break
+
+                    frames = len(block)
+                    if frames < self.block_size and not finished:
+                        # the renderer is late, silence is played while it catches up
+                        self.underruns += 1
+                        block = np.concatenate([block, np.zeros(self.block_size - frames)])
+
+                    if self.startup_latency is None:
+                        self.startup_latency = time.perf_counter() - started
+                    self.latency = len(self.ring) / frame_rate
+                    self.max_latency = max(self.max_latency, self.latency)
+
+                    self.sink.write(block)
+                    self.played_frames += frames
+            finally:
+                self.sink.close()
+        except Exception as e:
+            self.error = e
+        finally:
+            # stops the producer when the sink failed
+            self.ring.close()
+
+    def start(self):
+        """Start the rendering and the playback in background threads"""
+        self.producer = threading.Thread(target=self.produce, daemon=True)
+        self.consumer = threading.Thread(target=self.consume, daemon=True)
+        self.producer.start()
+        self.consumer.start()
+        return self
+
+    def wait(self):
+        """Wait for the end of the playback"""
+        self.consumer.join()
+        self.producer.join()
+        if self.error:
+            raise self.error
+
+    def stop(self):
+        self.stopped.set()
+        self.ring.close()
+        self.wait()
+
+    def play(self, block: bool = True):
+        self.start()
+        if block:
+            self.wait()
+        return self
@@ -0,0 +1,231 @@
+import json
+import time
+import tracemalloc
+
+from .RenderCache import public_attributes
+
+
+def traced_peak():
+    """The peak of traced memory since the last `reset_peak`, the current traced memory before Python 3.9 (no reset)"""
+    current, peak = tracemalloc.get_traced_memory()
+    return peak if hasattr(tracemalloc, 'reset_peak') else current
+
+
+def find_signals(value, result):
+    from .Signal import Signal
+
+    if isinstance(value, Signal):
+        result.append(value)
+    elif isinstance(value, dict):
+        for item in value.values():
+            find_signals(item, result)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            find_signals(item, result)
+    return result
+
+
+def child_signals(signal):
+    """Return the signals held by the public attributes of the signal (directly or nested in lists, tuples or dicts)"""
+    return find_signals(list(public_attributes(signal).values()), [])
+
+
+def format_bytes(size):
+    for unit in ("B", "kB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def shorten(text, width):
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+class NodeStats:
+    """What the rendering of one node of the graph cost, its children included (except for `self_time`)"""
+
+    def __init__(self, signal):
+        self.signal = signal
+        self.calls = 0
+        self.frames = 0
+        self.time = 0.0
+        self.children_time = 0.0
+        self.allocated = 0
+
+    @property
+    def self_time(self):
+        return self.time - self.children_time
+
+    def to_dict(self):
+        return dict(node=repr(self.signal), type=type(self.signal).__name__, calls=self.calls, frames=self.frames,
+                    time=self.time, self_time=self.self_time, allocated=self.allocated)
+
+
+class Profiler:
+    """
+        Measure, for each node of a signal graph, the time spent rendering it, the frames it produced
+        and the peak of memory allocated while it rendered (children included)
+
+            with signal.profile() as profiler:
+                signal.to_wave("out.wav", duration=3)
+            print(profiler.report())
+
+        While profiling, the `sample_array` method of each node is wrapped (on the instance) :
+            - the render cache is bypassed for the profiled signal
+            - the SignalSum/SignalProd nodes are rendered one by one instead of as a single flat plan
+            - the rendering must happen in this process (don't use `workers`)
+        Before Python 3.9 the peak of memory can't be reset for each node : the memory held when the node and its
+        children return is measured instead, which misses the temporary arrays freed during the render.
+        Nodes sampled through `__call__` or `i_sample_data` by their parent are not measured.
+    """
+
+    def __init__(self, signal, memory: bool = True):
+        """
+        :param signal: the root of the graph to profile
+        :param memory: if True, the allocations are traced with `tracemalloc` (which slows the rendering down)
+        """
+        self.signal = signal
+        self.memory = memory
+        self.nodes = {}
+
+        self._stack = []
+        self._originals = {}
+        self._render_cache = None
+        self._started_tracing = False
+
+    def _walk(self, signal):
+        if id(signal) in self.nodes:
+            return
+        self.nodes[id(signal)] = NodeStats(signal)
+        for child in child_signals(signal):
+            self._walk(child)
+
+    def _enter(self, stats):
+        """Push the frame of a node starting to render : [stats, memory at start, peak memory so far]"""
+        if self.memory:
+            if self._stack:
+                # the peak is reset for the child, the peak reached so far by the parent is kept in its frame
+                parent = self._stack[-1]
+                parent[2] = max(parent[2], traced_peak())
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            frame = [stats, tracemalloc.get_traced_memory()[0], 0]
+        else:
+            frame = [stats, 0, 0]
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame, frames, elapsed):
+        self._stack.pop()
+        stats = frame[0]
+        stats.calls += 1
+        stats.frames += frames
+        stats.time += elapsed
+
+        if self._stack:
+            self._stack[-1][0].children_time += elapsed
+
+        if self.memory:
+            peak = max(frame[2], traced_peak())
+            stats.allocated = max(stats.allocated, peak - frame[1])
+            if self._stack:
+                self._stack[-1][2] = max(self._stack[-1][2], peak)
+
+    def _wrap(self, stats):
+        signal = stats.signal
+        original = vars(signal).get('sample_array')
+        method = original or type(signal).sample_array.__get__(signal)
+
+        def sample_array(time_sample):
+            frame = self._enter(stats)
+            start = time.perf_counter()
+            try:
+                return method(time_sample)
+            finally:
+                self._exit(frame, len(time_sample), time.perf_counter() - start)
+
+        signal.sample_array = sample_array
+        return original
+
+    def _clear_plans(self):
+        # the plans compiled with (or without) the wrapped methods don't apply anymore (see `SignalPlan.get_operation`)
+        for stats in self.nodes.values():
+            if getattr(stats.signal, '_plan', None) is not None:
+                stats.signal._plan = None
+
+    def start(self):
+        self._walk(self.signal)
+        self._originals = {key: self._wrap(stats) for key, stats in self.nodes.items()}
+        self._clear_plans()
+
+        # the render cache would hide the rendering
+        self._render_cache = vars(self.signal).get('render_cache', Ellipsis)
+        self.signal.render_cache = None
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def stop(self):
+        for key, stats in self.nodes.items():
+            if self._originals[key] is None:
+                del stats.signal.sample_array
+            else:
+                stats.signal.sample_array = self._originals[key]
+        self._clear_plans()
+
+        if self._render_cache is Ellipsis:
+            del self.signal.render_cache
+        else:
+            self.signal.render_cache = self._render_cache
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def to_dict(self, signal=None, seen=None):
+        """The stats as a tree of dicts (a node reached again through another parent has no children)"""
+        signal = self.signal if signal is None else signal
+        seen = set() if seen is None else seen
+        result = self.nodes[id(signal)].to_dict()
+        if id(signal) in seen:
+            result['shared'] = True
+            return result
+        seen.add(id(signal))
+        result['children'] = [self.to_dict(child, seen) for child in child_signals(signal)]
+        return result
+
+    def to_json(self, **config):
+        return json.dumps(self.to_dict(), **config)
+
+    def report(self, width: int = 60):
+        """
+            The stats as a text tree, one line per node annotated with its repr (shortened to `width` characters)
+            The children never rendered through their `sample_array` are summed up in a single line
+        """
+        lines = [f"{'time':>10} {'self':>10} {'calls':>6} {'frames':>10} {'allocated':>10}  node"]
+
+        def visit(node, depth):
+            text = ("  " * depth) + shorten(f"{node['type']}: {node['node']}", width)
+            if node.get('shared'):
+                text += "  (shared, see above)"
+            lines.append(f"{node['time'] * 1000:>8.2f}ms {node['self_time'] * 1000:>8.2f}ms {node['calls']:>6} "
+                         f"{node['frames']:>10} {format_bytes(node['allocated']):>10}  {text}")
+            children = node.get('children', [])
+            for child in children:
+                if child['calls']:
+                    visit(child, depth + 1)
+            hidden = sum(not child['calls'] for child in children)
+            if hidden:
+                lines.append(f"{'':>50}  {'  ' * (depth + 1)}({hidden} node(s) not rendered directly)")
+
+        visit(self.to_dict(), 0)
+        return "\n".join(lines)
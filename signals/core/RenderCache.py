@@ -0,0 +1,185 @@
+import hashlib
+import os
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+
+class Unhashable(Exception):
+    pass
+
+
+def public_attributes(value):
+    return {key: item for key, item in vars(value).items() if not key.startswith('_')}
+
+
+def state_of(value):
+    """The attributes of an object as they are pickled (without the runtime caches dropped by its `__getstate__`)"""
+    state = value.__getstate__() if hasattr(value, '__getstate__') else vars(value)
+    return {} if state is None else state
+
+
+def code_structure(code):
+    """Describe a code object without its memory address (nested code objects are described recursively)"""
+    return code.co_code, tuple(code_structure(const) if isinstance(const, types.CodeType) else repr(const)
+                               for const in code.co_consts)
+
+
+def structure_of(value, memo):
+    """Return a nested tuple describing the value, raise Unhashable if it can't be described structurally"""
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return type(value).__name__, repr(value)
+
+    if isinstance(value, (list, tuple)):
+        return type(value).__name__, tuple(structure_of(item, memo) for item in value)
+
+    if isinstance(value, dict):
+        return 'dict', tuple(sorted((repr(key), structure_of(item, memo)) for key, item in value.items()))
+
+    if isinstance(value, np.ndarray):
+        return 'ndarray', value.dtype.str, value.shape, hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+
+    if isinstance(value, np.generic):
+        return type(value).__name__, repr(value.item())
+
+    if isinstance(value, types.ModuleType):
+        return 'module', value.__name__
+
+    if id(value) in memo:
+        return memo[id(value)]
+    # placeholder to stop the recursion on cycles (functions referencing themselves, ...)
+    memo[id(value)] = ('cycle',)
+
+    if isinstance(value, types.FunctionType):
+        code = value.__code__
+        globals_used = tuple((name, structure_of(value.__globals__[name], memo))
+                             for name in code.co_names if name in value.__globals__)
+        result = ('function', value.__qualname__, code_structure(code),
+                  structure_of(value.__defaults__, memo),
+                  tuple(structure_of(cell.cell_contents, memo) for cell in value.__closure__ or ()),
+                  globals_used)
+
+    elif isinstance(value, types.BuiltinFunctionType):
+        result = 'builtin', getattr(value, '__module__', None), value.__qualname__
+
+    elif isinstance(value, type):
+        result = 'type', value.__module__, value.__qualname__
+
+    elif hasattr(value, 'structure'):
+        result = (type(value).__module__, type(value).__qualname__, structure_of(value.structure(), memo))
+
+    elif hasattr(value, '__dict__'):
+        result = (type(value).__module__, type(value).__qualname__, structure_of(state_of(value), memo))
+
+    else:
+        raise Unhashable(f"{type(value).__qualname__} objects can't be hashed structurally")
+
+    memo[id(value)] = result
+    return result
+
+
+def structural_hash(signal, time_sample=None, mode: str = None):
+    """
+        Hash of the structure of a signal graph (and of the time sample), None if the graph can't be hashed
+        Two graphs made of the same classes with the same parameters have the same hash
+    :param mode: how the graph is rendered, when it changes the values ("periodic" : tiled periods)
+    """
+    try:
+        description = structure_of(signal, {})
+    except Unhashable:
+        return None
+
+    if time_sample is not None:
+        description = (description, time_sample.t_origin, time_sample.i_offset, time_sample.n_frames,
+                       time_sample.frame_width)
+
+    if mode is not None:
+        description = (description, mode)
+
+    return hashlib.sha256(repr(description).encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """
+        Cache of rendered samples keyed by the structural hash of the signal and the time sample
+        The renders are kept in memory (least recently used first evicted, within `max_bytes`)
+        and optionally saved as `.npy` files in `directory`, which are loaded back memory-mapped.
+        The files are named after the version of the package too, so they aren't served once the code has changed.
+        The cached arrays are read-only, the callers get a copy.
+        Only use it with signals whose output is defined by their attributes (not with functions drawing random
+        numbers or reading some external state).
+        To enable it : `Signal.render_cache = RenderCache()`
+    """
+
+    def __init__(self, max_bytes: int = 128 * 2 ** 20, directory: str = None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    @property
+    def stats(self):
+        return dict(hits=self.hits, disk_hits=self.disk_hits, misses=self.misses, uncacheable=self.uncacheable,
+                    entries=len(self.entries), nbytes=self.nbytes)
+
+    def path_for(self, key):
+        from .. import __version__
+        return os.path.join(self.directory, f"{key}-{__version__}.npy")
+
+    def clear(self):
+        """Empty the memory tier (the files of the disk tier are kept)"""
+        self.entries.clear()
+        self.nbytes = 0
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+        if self.directory and os.path.exists(self.path_for(key)):
+            self.disk_hits += 1
+            return np.load(self.path_for(key), mmap_mode='r')
+
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        data.flags.writeable = False
+
+        if self.directory and not os.path.exists(self.path_for(key)):
+            np.save(self.path_for(key), data)
+
+        if data.nbytes <= self.max_bytes:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key).nbytes
+            self.entries[key] = data
+            self.nbytes += data.nbytes
+            while self.nbytes > self.max_bytes:
+                self.nbytes -= self.entries.popitem(last=False)[1].nbytes
+
+    def sample_array(self, signal, time_sample, render, mode: str = None):
+        """
+            Return the cached render of the signal over the time sample, or call `render()` and cache its result
+        :param mode: how `render` renders the signal, the renders of different modes are cached apart
+        """
+        key = structural_hash(signal, time_sample, mode)
+        if key is None:
+            self.uncacheable += 1
+            return render()
+
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data.copy())
+            return data
+        return np.array(data)
@@ -1,8 +1,24 @@
+from fractions import Fraction
+
+import numpy as np
+
 from .TimeSample import TimeSample
 from .SignalSample import SignalSample
+from .streaming import stream_to_wave
+from .Player import Player
+from .Profiler import Profiler
+from .support import sample_supported, overlapping
+from . import serialization
 
 
 class Signal:
+    # consulted by `sample`, set it to a RenderCache to cache the renders
+    render_cache = None
+
+    def __init_subclass__(cls, **config):
+        super().__init_subclass__(**config)
+        serialization.register_class(cls)
+
     def __call__(self, t):
         """
             For a given time (in seconds) return the corresponding height of the signal
@@ -18,14 +34,116 @@ class Signal:
     def sample_data(self, time_sample):
         return tuple(self.i_sample_data(time_sample))
 
+    def sample_array(self, time_sample):
+        """
+            Return the values of the signal over the time sample as a numpy array
+            This default implementation relies on `i_sample_data`, subclasses should override it with a vectorized version
+        :param time_sample: The TimeSample to sample the signal on
+        :return: A numpy array of `len(time_sample)` floats
+        """
+        return np.fromiter(self.i_sample_data(time_sample), dtype=float, count=len(time_sample))
+
+    def tile_frames(self, time_sample, tolerance: float = 0.01):
+        """
+            Return the smallest whole number of frames made of whole periods of the signal,
+            None if the signal isn't periodic or if no such number of frames fits twice in the time sample
+        :param time_sample: The TimeSample the signal would be tiled on
+        :param tolerance: The maximum phase drift (in frames) accumulated over the time sample by the tiling
+        """
+        try:
+            period = getattr(self, 'period', 0)
+        except AssertionError:
+            # compound signals aren't periodic when one of their compounds isn't
+            return None
+
+        if not period or period == float('inf'):
+            return None
+
+        period_frames = period / time_sample.frame_width
+        tile = Fraction(period_frames).limit_denominator(max(1, int(len(time_sample) // (2 * period_frames))))
+        frames = tile.numerator
+        if frames < 1 or 2 * frames > len(time_sample):
+            return None
+
+        drift = abs(tile.denominator * period_frames - frames) * len(time_sample) / frames
+        return frames if drift <= tolerance else None
+
+    def sample_periodic_array(self, time_sample, tolerance: float = 0.01):
+        """
+            Same as `sample_array` but when the signal is periodic only whole periods are rendered and then repeated,
+            (see `tile_frames`) so steady signals cost the duration of their period instead of the whole time sample
+        """
+        frames = self.tile_frames(time_sample, tolerance)
+        if frames is None:
+            return self.sample_array(time_sample)
+        return np.resize(self.sample_array(time_sample.segment(0, frames)), len(time_sample))
+
+    @property
+    def support(self):
+        """
+            The [start, end) intervals (in seconds) out of which the signal is 0, None if it may be non zero at any time
+            Renderers skip the frames out of the support (see the `support` module)
+        """
+        return None
+
+    def support_between(self, t_min: float, t_max: float):
+        """The intervals of the support overlapping [t_min, t_max] (see `support`)"""
+        return overlapping(self.support, t_min, t_max)
+
+    def to_json(self, **config):
+        """Return the declarative description of the signal graph as JSON (see the `serialization` module)"""
+        return serialization.to_json(self, **config)
+
+    def to_bytes(self):
+        """Return the compact binary description of the signal graph (see the `serialization` module)"""
+        return serialization.to_bytes(self)
+
+    @staticmethod
+    def from_json(text):
+        """Return the signal graph described by `to_json`"""
+        return serialization.from_json(text)
+
+    @staticmethod
+    def from_bytes(data):
+        """Return the signal graph described by `to_bytes`"""
+        return serialization.from_bytes(data)
+
+    def control_rate(self, interval: int = 64, interpolation: str = "linear"):
+        """Return the signal evaluated every `interval` frames and interpolated in between (see ControlRate)"""
+        from ..ControlRate import ControlRate
+        return ControlRate(self, interval=interval, interpolation=interpolation)
+
+    def profile(self, memory: bool = True):
+        """
+            Return a Profiler of the signal graph, to use as a context manager around `sample`, `to_wave`, ...
+        :param memory: if True, the peak memory allocated by each node is measured too
+        """
+        return Profiler(self, memory=memory)
+
+    def i_sample_blocks(self, time_sample, block_size=2048):
+        """Yield the values of the signal over the time sample as consecutive numpy arrays of (at most) `block_size` frames"""
+        for block in time_sample.blocks(block_size):
+            yield sample_supported(self, block)
+
     def sample(self,
                duration: float = None,
                t_max: float = None, n_frames: int = None,
-               t_min: float = 0, frame_rate: float = 44100.0):
+               t_min: float = 0, frame_rate: float = 44100.0,
+               workers: int = None, periodic: bool = False):
+        """
+            Sample the signal over the time sample defined by the params (see TimeSample)
+            If `workers` is greater than 1, the time sample is split into segments rendered in that many processes
+            If `periodic` is True, periodic signals are rendered once per period and tiled (see `sample_periodic_array`),
+            in a single process (it can't be combined with `workers`)
+            The render is looked up in (and stored to) `Signal.render_cache` when it is set
+        """
         time_sample = TimeSample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate)
         return SignalSample.from_signal(
             time_sample=time_sample,
-            signal=self
+            signal=self,
+            workers=workers,
+            cache=self.render_cache,
+            periodic=periodic
         )
 
     def to_wave(self,
@@ -33,28 +151,49 @@ class Signal:
                 duration: float = None,
                 t_max: float = None, n_frames: int = None,
                 t_min: float = 0, frame_rate: float = 44100.0,
-                norm_to=None, sampwidth=2, bufsize=2048):
-        """Sample methods made accessible from the signal directly (see the corresponding method definition in the SignalSample class)"""
-        self.sample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate) \
-            .to_wave(filepath=filepath, norm_to=norm_to, sampwidth=sampwidth, bufsize=bufsize)
+                norm_to=None, sampwidth=2, bufsize=2048, float_pcm=False,
+                stream=False, norm_mode="prepass", workers: int = None):
+        """
+            Sample methods made accessible from the signal directly (see the corresponding method definition in the SignalSample class)
+            With `stream=True` the signal is rendered `bufsize` frames at a time and each block is written directly,
+            so the whole render is never held in memory (see `streaming.stream_to_wave` for `norm_mode`)
+        """
+        if stream:
+            time_sample = TimeSample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate)
+            stream_to_wave(self, time_sample, filepath, norm_to=norm_to, norm_mode=norm_mode,
+                           sampwidth=sampwidth, block_size=bufsize, float_pcm=float_pcm)
+        else:
+            self.sample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate,
+                        workers=workers) \
+                .to_wave(filepath=filepath, norm_to=norm_to, sampwidth=sampwidth, bufsize=bufsize, float_pcm=float_pcm)
 
     def play(self,
              duration: float = None,
              t_max: float = None, n_frames: int = None,
              t_min: float = 0, frame_rate: float = 44100.0,
-             norm_to=None, sampwidth=2, bufsize=2048):
-        """Sample methods made accessible from the signal directly (see the corresponding method definition in the SignalSample class)"""
+             norm_to=None, sampwidth=2, bufsize=2048, float_pcm=False,
+             sink=None, block: bool = True):
+        """
+            Sample methods made accessible from the signal directly (see the corresponding method definition in the SignalSample class)
+            With a `sink` (see the `sinks` module) the signal is played in real time while it renders, `bufsize` frames
+            at a time, and the Player is returned (`block=False` returns as soon as the playback has started)
+        """
+        if sink is not None:
+            time_sample = TimeSample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate)
+            return Player(self, time_sample, sink, block_size=bufsize, norm_to=norm_to).play(block=block)
+
         self.sample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate) \
-            .play(norm_to=norm_to, sampwidth=sampwidth, bufsize=bufsize)
+            .play(norm_to=norm_to, sampwidth=sampwidth, bufsize=bufsize, float_pcm=float_pcm)
 
     def plot(self,
              duration: float = None,
              t_max: float = None, n_frames: int = None,
              t_min: float = 0, frame_rate: float = 44100.0,
-             title: str = "", xlabel: str = "", ylabel: str = "", export_to: str = None):
+             title: str = "", xlabel: str = "", ylabel: str = "", export_to: str = None,
+             view: tuple = None, width: int = None):
         """Sample methods made accessible from the signal directly (see the corresponding method definition in the SignalSample class)"""
         self.sample(duration=duration, t_min=t_min, t_max=t_max, n_frames=n_frames, frame_rate=frame_rate) \
-            .plot(xlabel=xlabel, ylabel=ylabel, title=title, export_to=export_to)
+            .plot(xlabel=xlabel, ylabel=ylabel, title=title, export_to=export_to, view=view, width=width)
 
     __add__ = None
     __mul__ = None
@@ -0,0 +1,153 @@
+from collections import Counter
+
+import numpy as np
+
+from .support import sample_supported
+
+EVAL = "eval"
+ZERO = "zero"
+COPY = "copy"
+
+
+def plan_support(signal, supports):
+    """The support of the signal, the supports of the SignalSum/SignalProd being computed once from their compounds"""
+    stack = [signal]
+    while stack:
+        node = stack[-1]
+        combine = getattr(node, 'plan_support', None)
+        if id(node) in supports:
+            stack.pop()
+        elif combine is None:
+            supports[id(node)] = node.support
+            stack.pop()
+        else:
+            missing = [compound for compound in node.signals if id(compound) not in supports]
+            if missing:
+                stack.extend(missing)
+            else:
+                supports[id(node)] = combine(*(supports[id(compound)] for compound in node.signals))
+                stack.pop()
+    return supports[id(signal)]
+
+
+def get_operation(signal, root=False, supports=None):
+    """
+        Return the numpy operation combining the compounds of the signal, None if the signal must be sampled as a whole
+    :param supports: the supports already computed (see `plan_support`)
+    """
+    if not root and 'sample_array' in vars(signal):
+        # the instance has its own sampling method (profiling, ...) which must be respected,
+        # except for the root of the plan which is the one being sampled by that method
+        return None
+    operation = getattr(signal, 'plan_operation', None)
+    if operation is not None and not root and plan_support(signal, {} if supports is None else supports) is not None:
+        # a compound with a bounded support is sampled on its own, only in its support
+        return None
+    return operation
+
+
+class SignalPlan:
+    """
+        Flat evaluation plan of a tree of SignalSum/SignalProd
+        Each node is lowered into in-place operations on a pool of buffers :
+            - a signal appearing several times in the tree is computed once
+            - a buffer is given back to the pool as soon as its last reader has used it
+        Signals that are not SignalSum/SignalProd are leaves, sampled with their own `sample_array` method
+        in their support only, like the SignalSum/SignalProd with a bounded support
+    """
+
+    def __init__(self, signal):
+        self.operations = []
+        self.n_buffers = 0
+
+        self._free = []
+        self._slots = {}
+        self._remaining = Counter()
+        self._supports = {}
+        self._count_uses(signal, root=True)
+        self.output = self._compile(signal, root=True)
+
+        del self._free, self._slots, self._remaining, self._supports
+
+    def __repr__(self):
+        return "\n".join(f"{kind if isinstance(kind, str) else kind.__name__} {target} {argument!r}"
+                         for kind, target, argument in self.operations)
+
+    def _count_uses(self, signal, root=False):
+        first_visit = id(signal) not in self._remaining
+        self._remaining[id(signal)] += 1
+        if first_visit and get_operation(signal, root, self._supports) is not None:
+            for compound in signal.signals:
+                self._count_uses(compound)
+
+    def _allocate(self):
+        if self._free:
+            return self._free.pop()
+        self.n_buffers += 1
+        return self.n_buffers - 1
+
+    def _release(self, signal):
+        """Mark one use of the signal as done, return True if it was the last one"""
+        self._remaining[id(signal)] -= 1
+        return self._remaining[id(signal)] == 0
+
+    def _compile(self, signal, root=False):
+        if id(signal) in self._slots:
+            return self._slots[id(signal)]
+
+        operation = get_operation(signal, root, self._supports)
+
+        if operation is None:
+            slot = self._allocate()
+            self.operations.append((EVAL, slot, signal))
+
+        elif not signal.signals:
+            slot = self._allocate()
+            self.operations.append((ZERO, slot, None))
+
+        else:
+            first, *others = signal.signals
+            source = self._compile(first)
+            if self._release(first):
+                # nobody else reads the first compound, its buffer becomes the accumulator
+                slot = source
+            else:
+                slot = self._allocate()
+                self.operations.append((COPY, slot, source))
+
+            for other in others:
+                source = self._compile(other)
+                self.operations.append((operation, slot, source))
+                if self._release(other):
+                    self._free.append(source)
+
+        self._slots[id(signal)] = slot
+        return slot
+
+    def run(self, time_sample):
+        """Execute the plan over the time sample and return the result as a numpy array"""
+        buffers = [np.empty(len(time_sample)) for _ in range(self.n_buffers)]
+
+        for kind, target, argument in self.operations:
+            if kind is EVAL:
+                np.copyto(buffers[target], sample_supported(argument, time_sample))
+            elif kind is ZERO:
+                buffers[target].fill(0.0)
+            elif kind is COPY:
+                np.copyto(buffers[target], buffers[argument])
+            else:
+                kind(buffers[target], buffers[argument], out=buffers[target])
+
+        return buffers[self.output]
+
+
+def sample_plan(signal, time_sample):
+    """
+        Sample a SignalSum/SignalProd with a single plan, run on each range of frames of its support
+        The plan is compiled on the first render and kept by the signal (`_plan`), so its compounds must not be changed
+        afterwards
+    """
+    plan = getattr(signal, '_plan', None)
+    if plan is None:
+        plan = signal._plan = SignalPlan(signal)
+    return sample_supported(signal, time_sample, plan.run)
@@ -1,9 +1,18 @@
 from functools import reduce
 from operator import mul
-from .Signal import Signal
+
+import numpy as np
+
+from .SignalPlan import sample_plan
+from .support import intersection
+from .Signal import Signal, PeriodicSignal
+from .utils import MathUtils
 
 
 class SignalProd(Signal):
+    plan_operation = np.multiply
+    plan_support = staticmethod(intersection)
+
     @classmethod
     def parse_signals(cls, *signals):
         final = []
@@ -17,6 +26,29 @@ class SignalProd(Signal):
     def __init__(self, *signals):
         assert all(isinstance(signal, Signal) for signal in signals)
         self.signals = SignalProd.parse_signals(*signals)
+        self._plan = None
+
+    def __getstate__(self):
+        # the plan is compiled again on demand
+        return dict(vars(self), _plan=None)
+
+    @property
+    def period(self):
+        """Can be calculated only if all of it's compounds are periodic"""
+        assert all(isinstance(signal, PeriodicSignal) for signal in self.signals), \
+            "SignalProd.period exists only when all the compounds are periodic ! "
+        periods = [signal.period for signal in self.signals]
+        if 0 in periods:
+            return 0
+        else:
+            return MathUtils.ppcm(*periods)
+
+    @property
+    def support(self):
+        return intersection(*(signal.support for signal in self.signals))
+
+    def support_between(self, t_min, t_max):
+        return intersection(*(signal.support_between(t_min, t_max) for signal in self.signals))
 
     def __repr__(self):
         return " * ".join(map(repr, self.signals))
@@ -34,3 +66,6 @@ class SignalProd(Signal):
                 yield reduce(mul, values)
             else:
                 yield 0
+
+    def sample_array(self, time_sample):
+        return sample_plan(self, time_sample)
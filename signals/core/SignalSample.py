@@ -1,47 +1,135 @@
-import os
-import sys
-import struct
-import wave
-import random
+import io
 import numpy as np
-from .playsound import playsound
+from .playsound import playsound_bytes
 
 try:
     import matplotlib.pyplot as plt
 except:
     plt = None
 
-from .utils import grouper
+from .wavefile import WaveWriter, WaveData, peak
+from .parallel import parallel_sample_array
+from .support import sample_supported
+from . import spectral
 
 from .TimeSample import TimeSample
+from .MinMaxPyramid import MinMaxPyramid
 
 
 class SignalSample:
     temp_wave_filepath = "temp.wav"
 
     @classmethod
-    def from_signal(cls, time_sample, signal):
-        return cls(time_sample=time_sample, Y=signal.sample_data(time_sample))
+    def from_signal(cls, time_sample, signal, workers: int = None, cache=None, periodic: bool = False):
+        assert not (periodic and workers and workers > 1), \
+            "SignalSample.from_signal, periodic renders are done in a single process, don't give workers"
+
+        def render():
+            if periodic:
+                return signal.sample_periodic_array(time_sample)
+            elif workers and workers > 1:
+                return parallel_sample_array(signal, time_sample, workers=workers)
+            else:
+                return sample_supported(signal, time_sample)
+
+        if cache is None:
+            return cls(time_sample=time_sample, Y=render())
+        else:
+            return cls(time_sample=time_sample, Y=cache.sample_array(signal, time_sample, render,
+                                                                   mode="periodic" if periodic else None))
+
+    @classmethod
+    def from_wave(cls, filepath, channel: int = None):
+        """
+            Load a wave file, the frames are memory mapped
+            32 bits float files are not copied (Y is the float32 memory map), integer files are decoded in memory
+        :param filepath: the path of the wave file
+        :param channel: if given, only this channel is loaded, else Y has the shape (n_frames, n_channels) for multichannel files
+        """
+        data = WaveData.from_file(filepath)
+        return cls(time_sample=TimeSample(t_min=0, n_frames=len(data), frame_rate=data.framerate),
+                   Y=data.to_array(channel))
 
     def __init__(self, time_sample: TimeSample, Y):
         assert len(time_sample) == len(Y)
         self.time_sample = time_sample
-        self.Y = Y
-
-    def plot(self, title: str = "", xlabel: str = "", ylabel: str = "", export_to: str = None):
+        Y = np.asarray(Y)
+        # floating arrays are kept as they are, so that memory maps aren't copied
+        self.Y = Y if Y.dtype.kind == 'f' else Y.astype(float)
+        self._pyramid = None
+
+    @property
+    def pyramid(self):
+        """The MinMaxPyramid of Y, computed on the first use (Y shall not be modified afterwards)"""
+        if self._pyramid is None:
+            self._pyramid = MinMaxPyramid(self.Y)
+        return self._pyramid
+
+    def frame_at(self, t):
+        """The index of the frame at the time t (not bounded to the sample)"""
+        return int(round((t - self.time_sample.t_origin) / self.time_sample.frame_width)) - self.time_sample.i_offset
+
+    def envelope(self, t_min: float = None, t_max: float = None, width: int = 1000):
         """
+            The values of the sample between t_min and t_max reduced to about `width` points keeping the peaks
+            When there are less than `2 * width` frames, the frames themselves are returned
+        :return: the times, the minimums and the maximums (the same arrays when the frames are returned)
+        """
+        start = 0 if t_min is None else max(0, self.frame_at(t_min))
+        stop = len(self.Y) if t_max is None else min(len(self.Y), self.frame_at(t_max) + 1)
+        if stop - start <= 2 * width:
+            values = self.Y[start:stop]
+            return self.time_sample.segment(start, max(start, stop)).to_array(), values, values
+
+        starts, size, mins, maxs = self.pyramid.envelope(start, stop, width)
+        times = self.time_sample.t_origin + (self.time_sample.i_offset + starts + size / 2) * self.time_sample.frame_width
+        return times, mins, maxs
+
+    def plot(self, title: str = "", xlabel: str = "", ylabel: str = "", export_to: str = None,
+             view: tuple = None, width: int = None):
+        """
+            The long samples are drawn as their min/max envelope, computed again from the `pyramid` when zooming
             :param title: the plot title
             :param xlabel: the label for the x axis (time axis)
             :param ylabel: the label for the y axis (amplitude axis)
 
             :param export_to: if you want to export the plot as an image, give it the desired filepath for the image
+            :param view: the (t_min, t_max) range to show, by default the whole sample
+            :param width: the number of points of the envelope, by default the width of the figure in pixels
         """
         if not plt:
             raise Exception(f"To use the .plot method you must install `matplotlib` using the command : "
                             f"pip install matplotlib")
 
         fig, ax = plt.subplots()
-        ax.plot(list(self.time_sample), self.Y)
+        width = width or int(fig.get_size_inches()[0] * fig.dpi)
+        artists = []
+
+        def draw(t_min, t_max):
+            for artist in artists:
+                artist.remove()
+            artists.clear()
+
+            times, mins, maxs = self.envelope(t_min, t_max, width)
+            if mins is maxs:
+                artists.extend(ax.plot(times, mins, color="C0"))
+            else:
+                mins, maxs = mins.reshape(len(mins), -1), maxs.reshape(len(maxs), -1)
+                for channel in range(mins.shape[1]):
+                    artists.append(ax.fill_between(times, mins[:, channel], maxs[:, channel],
+                                                   color=f"C{channel}", linewidth=0.5))
+
+        t_min, t_max = view or (None, None)
+        draw(t_min, t_max)
+        if view:
+            ax.set_xlim(*view)
+        ax.set_autoscale_on(False)
+
+        def on_zoom(axes):
+            draw(*axes.get_xlim())
+            fig.canvas.draw_idle()
+
+        ax.callbacks.connect('xlim_changed', on_zoom)
 
         ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
         ax.grid()
@@ -49,57 +137,66 @@ class SignalSample:
             fig.savefig(export_to)
         plt.show()
 
-    def to_wave(self, filepath, norm_to=None, sampwidth=2, bufsize=2048):
-        nchannels = 2
+    @property
+    def frame_rate(self):
+        return 1 / self.time_sample.frame_width
 
-        data = self.Y
+    def spectrum(self, size: int = 8192, hop: int = None, window="hann"):
+        """
+            The amplitude spectrum of the sample, averaged over windows of `size` frames (see `spectral.spectrum`)
+        :return: the frequencies (in Hz) and the amplitudes of the `size // 2 + 1` bins
+        """
+        frequencies = np.fft.rfftfreq(size, self.time_sample.frame_width)
+        return frequencies, spectral.spectrum(self.Y, size=size, hop=hop, window=window)
 
-        if norm_to is not None:
-            data = list(data)
-            amplitude_max = max(map(abs, data))
-            data = ((norm_to * amplitude) / amplitude_max for amplitude in data)
+    def stft(self, size: int = 2048, hop: int = 512, window="hann"):
+        """
+            The short-time Fourier transform of the sample (see `spectral.stft`)
+        :return: the times of the centers of the windows, the frequencies (in Hz) and the complex spectra
+        """
+        starts, spectra = spectral.stft(self.Y, size=size, hop=hop, window=window)
+        return self.window_times(starts, size), np.fft.rfftfreq(size, self.time_sample.frame_width), spectra
 
-        samples = [data]
+    def spectrogram(self, size: int = 2048, hop: int = 512, window="hann", db: bool = False):
+        """
+            The amplitudes of the short-time Fourier transform of the sample as float32 (see `spectral.spectrogram`)
+        :return: the times of the centers of the windows, the frequencies (in Hz) and the amplitudes
+        """
+        starts, amplitudes = spectral.spectrogram(self.Y, size=size, hop=hop, window=window, db=db)
+        return self.window_times(starts, size), np.fft.rfftfreq(size, self.time_sample.frame_width), amplitudes
 
-        with wave.open(filepath, 'w') as file:
-            file.setparams((nchannels, sampwidth, self.time_sample.frame_rate, self.time_sample.n_frames, 'NONE',
-                            'not compressed'))
+    def window_times(self, starts, size):
+        return self.time_sample.t_origin + (self.time_sample.i_offset + starts + size / 2) * self.time_sample.frame_width
 
-            bin_size = 2 ** (sampwidth * 8)
+    def to_wave(self, filepath, norm_to=None, sampwidth=2, bufsize=2048, float_pcm=False):
+        """
+            Save the sample as a wave file
+        :param filepath: the path of the wave file, or a binary file object opened for writing
+        :param norm_to: if given, the data is scaled so that its peak amplitude equals `norm_to`
+        :param sampwidth: the number of bytes per sample (1, 2, 3 or 4)
+        :param bufsize: the number of frames converted and written at once
+        :param float_pcm: if True the samples are written as 32 bits floats (requires sampwidth=4)
+        """
+        data = self.Y
+        nchannels = 1 if data.ndim == 1 else data.shape[1]
 
-            max_amplitude = float(int(bin_size / 2) - 1)
+        gain = 1.0
+        if norm_to is not None:
+            amplitude_max = peak(data)
+            if amplitude_max:
+                gain = norm_to / amplitude_max
 
-            def bounds(value):
-                if value < -bin_size // 2:
-                    return -bin_size // 2
-                elif value >= bin_size // 2:
-                    return bin_size // 2 - 1
-                else:
-                    return value
+        with WaveWriter(filepath, nchannels=nchannels, sampwidth=sampwidth, framerate=self.time_sample.frame_rate,
+                        nframes=len(data), float_pcm=float_pcm) as file:
+            for start in range(0, len(data), bufsize):
+                file.write(data[start:start + bufsize], gain=gain)
 
-            for chunk in grouper(bufsize, samples):
-                frames = b''.join(
-                    b''.join(
-                        struct.pack('h', int(bounds(max_amplitude * sample))) for sample in channels
-                    ) for channels in chunk if channels is not None
-                )
-                file.writeframesraw(frames)
+    def to_wave_bytes(self, norm_to=None, sampwidth=2, bufsize=2048, float_pcm=False):
+        """Encode the sample as a wave file held in memory (see `to_wave` for the params) and return it as a memoryview"""
+        buffer = io.BytesIO()
+        self.to_wave(buffer, norm_to=norm_to, sampwidth=sampwidth, bufsize=bufsize, float_pcm=float_pcm)
+        return buffer.getbuffer()
 
     def play(self, block=True, **config):
-        fp = ""
-        while not fp or os.path.exists(fp):
-            fp = f"temp_{random.random()}.wav"
-
-        try:
-            self.to_wave(fp, **config)
-        except Exception as e:
-            if os.path.exists(fp):
-                os.remove(fp)
-            raise e
-
-        playsound(fp, block=block)
-
-        try:
-            os.remove(fp)
-        except:
-            print("The temp file haven't been deleted properly !", file=sys.stderr)
+        """Play the sample without writing it to the disk when possible (see `playsound.playsound_bytes`)"""
+        playsound_bytes(self.to_wave_bytes(**config), block=block)
@@ -1,10 +1,18 @@
 from functools import reduce
 from operator import add
+
+import numpy as np
+
+from .SignalPlan import sample_plan
+from .support import union
 from .Signal import Signal, PeriodicSignal
 from .utils import MathUtils
 
 
 class SignalSum(Signal):
+    plan_operation = np.add
+    plan_support = staticmethod(union)
+
     @classmethod
     def parse_signals(cls, *signals):
         final = []
@@ -18,6 +26,11 @@ class SignalSum(Signal):
     def __init__(self, *signals):
         assert all(isinstance(signal, Signal) for signal in signals)
         self.signals = SignalSum.parse_signals(*signals)
+        self._plan = None
+
+    def __getstate__(self):
+        # the plan is compiled again on demand
+        return dict(vars(self), _plan=None)
 
     @property
     def period(self):
@@ -30,6 +43,13 @@ class SignalSum(Signal):
         else:
             return MathUtils.ppcm(*periods)
 
+    @property
+    def support(self):
+        return union(*(signal.support for signal in self.signals))
+
+    def support_between(self, t_min, t_max):
+        return union(*(signal.support_between(t_min, t_max) for signal in self.signals))
+
     def __repr__(self):
         return " + ".join(map(repr, self.signals))
 
@@ -46,3 +66,6 @@ class SignalSum(Signal):
                 yield reduce(add, values)
             else:
                 yield 0
+
+    def sample_array(self, time_sample):
+        return sample_plan(self, time_sample)
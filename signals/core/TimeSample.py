@@ -1,10 +1,17 @@
+import numpy as np
+
+
 def are_defined(*values):
     """Used to know if params are defined in the signature"""
     return None not in values
 
 
 class TimeSample:
-    """Represent the discrete time sample based on params"""
+    """
+        Represent the discrete time sample based on params
+        A time sample is immutable and only describes the frames : the times are only computed by `to_array` (and cached).
+        Slicing (`time_sample[a:b]`), `split` and `blocks` give time samples sharing the times of their parent.
+    """
 
     def __init__(self, t_min=None, t_max=None, duration=None, n_frames=None, frame_rate=None):
         """
@@ -35,7 +42,7 @@ class TimeSample:
         if are_defined(t_min, t_max):
             self.duration = t_max - t_min
             if are_defined(n_frames):
-                self.frame_rate = self.duration / n_frames
+                self.frame_rate = n_frames / self.duration
             elif are_defined(frame_rate):
                 self.n_frames = int(self.duration * frame_rate)
             else:
@@ -43,7 +50,7 @@ class TimeSample:
         elif are_defined(t_min, duration):
             self.t_max = t_min + duration
             if are_defined(n_frames):
-                self.frame_rate = self.duration / n_frames
+                self.frame_rate = n_frames / self.duration
             elif are_defined(frame_rate):
                 self.n_frames = int(self.duration * frame_rate)
             else:
@@ -51,13 +58,13 @@ class TimeSample:
         elif are_defined(t_max, duration):
             self.t_min = t_max - duration
             if are_defined(n_frames):
-                self.frame_rate = self.duration / n_frames
+                self.frame_rate = n_frames / self.duration
             elif are_defined(frame_rate):
                 self.n_frames = int(self.duration * frame_rate)
             else:
                 raise Exception(f"Uncomplete definition ! {dict(t_min=t_min, t_max=t_max, duration=duration, n_frames=n_frames, frame_rate=frame_rate)}")
         elif are_defined(n_frames, frame_rate):
-            self.duration = n_frames * frame_rate
+            self.duration = n_frames / frame_rate
             if are_defined(t_min):
                 self.t_max = t_min + self.duration
             elif are_defined(t_max):
@@ -69,9 +76,91 @@ class TimeSample:
 
         self.frame_width = 1 / self.frame_rate
 
+        # the times are computed as `t_origin + (i_offset + i_frame) * frame_width`,
+        # so that a segment of a time sample gives exactly the same times as the time sample itself
+        self.t_origin = self.t_min
+        self.i_offset = 0
+        self._times = None
+        self._frozen = True
+
+    @classmethod
+    def from_frames(cls, first, n_frames, frame_rate, t_origin=0.0):
+        """
+            Return the time sample made of the frames `first` to `first + n_frames` of the grid of times
+            `t_origin + i / frame_rate`. Time samples taken from the same grid give exactly the same time for the same frame
+        """
+        result = cls(t_min=t_origin + first / frame_rate, n_frames=n_frames, frame_rate=frame_rate)
+        vars(result).update(t_origin=t_origin, i_offset=first)
+        return result
+
+    def __setattr__(self, key, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"TimeSample objects are immutable, can't set {key!r}")
+        super().__setattr__(key, value)
+
+    def __getstate__(self):
+        # the cached times are not worth pickling
+        return dict(vars(self), _times=None)
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+
+    def __repr__(self):
+        return f"TimeSample(t_min={self.t_min}, n_frames={self.n_frames}, frame_rate={self.frame_rate})"
+
     def __iter__(self):
-        for i_frame in range(self.n_frames):
-            yield self.t_min + i_frame * self.frame_width
+        for i_frame in range(self.i_offset, self.i_offset + self.n_frames):
+            yield self.t_origin + i_frame * self.frame_width
 
     def __len__(self):
         return self.n_frames
+
+    def __getitem__(self, key):
+        """The time of a frame, or for a slice (without step) the time sample of the frames in the slice"""
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.n_frames)
+            assert step == 1, "TimeSample.__getitem__, slices with a step are not supported"
+            return self.segment(start, max(start, stop))
+
+        if key < 0:
+            key += self.n_frames
+        if not 0 <= key < self.n_frames:
+            raise IndexError("TimeSample index out of range")
+        return self.t_origin + (self.i_offset + key) * self.frame_width
+
+    def segment(self, start, stop):
+        """Return the time sample made of the frames `start` (included) to `stop` (excluded)"""
+        assert 0 <= start <= stop <= self.n_frames
+        return self.grid(start, stop)
+
+    def grid(self, start, stop):
+        """Same as `segment` but the frames can lie before or after this time sample, on the same grid of times"""
+        assert start <= stop
+        result = TimeSample(t_min=self.t_origin + (self.i_offset + start) * self.frame_width,
+                            n_frames=stop - start,
+                            frame_rate=self.frame_rate)
+        # bypass the immutability to share the times of this time sample
+        vars(result).update(t_origin=self.t_origin, i_offset=self.i_offset + start, frame_width=self.frame_width)
+        if self._times is not None and 0 <= start <= stop <= self.n_frames:
+            vars(result).update(_times=self._times[start:stop])
+        return result
+
+    def split(self, parts):
+        """Split the time sample into (at most) `parts` contiguous non empty time samples of (almost) the same size"""
+        assert parts > 0
+        bounds = [i_part * self.n_frames // parts for i_part in range(parts + 1)]
+        return [self.segment(start, stop) for start, stop in zip(bounds, bounds[1:]) if start < stop]
+
+    def blocks(self, block_size):
+        """Split the time sample into consecutive time samples of (at most) `block_size` frames"""
+        assert block_size > 0
+        for start in range(0, self.n_frames, block_size):
+            yield self.segment(start, min(start + block_size, self.n_frames))
+
+    def to_array(self):
+        """Return the times of the sample (in seconds) as a read-only numpy array, computed on the first call"""
+        if self._times is None:
+            times = self.t_origin + (self.i_offset + np.arange(self.n_frames)) * self.frame_width
+            times.setflags(write=False)
+            vars(self)['_times'] = times
+        return self._times
@@ -1,7 +1,13 @@
 from .Signal import Signal, PeriodicSignal, SimpleSignal
 from .SignalSum import SignalSum
 from .SignalProd import SignalProd
+from .Filter import Filter
 from .utils import *
+from .Player import Player
+from .Profiler import Profiler
+from .RenderCache import RenderCache
+from .serialization import NamedFunction, NotSerializable, named, register_function, register_class
+from .sinks import NullSink, PipeSink, DeviceSink
 
 Signal.__add__ = Signal.__iadd__ = lambda self, other: SignalSum(self, other)
 Signal.__mul__ = Signal.__imul__ = lambda self, other: SignalProd(self, other)
@@ -0,0 +1,74 @@
+"""
+    Counter-based noise engine
+    The random values are generated by pages of PAGE_SIZE frames, each page having its own generator seeded with
+    (seed, stream, page). The value of a frame only depends on the seed and on its absolute index on the time grid,
+    so a render gives the same bits whether it is done in one pass, by blocks or across processes.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+PAGE_SIZE = 2048
+DISTRIBUTIONS = ("uniform", "normal")
+
+
+def new_seed():
+    """A fresh random seed, for noises created without one"""
+    return np.random.SeedSequence().entropy
+
+
+def first_frame(time_sample):
+    """Absolute index (on the grid of frames starting at t=0) of the first frame of the time sample"""
+    return int(round(time_sample.t_origin / time_sample.frame_width)) + time_sample.i_offset
+
+
+@lru_cache(maxsize=64)
+def page_values(seed, stream, page, distribution):
+    rng = np.random.default_rng([seed, stream, page % 2 ** 64])
+    if distribution == "uniform":
+        values = rng.uniform(-1.0, 1.0, PAGE_SIZE)
+    else:
+        values = rng.standard_normal(PAGE_SIZE)
+    values.flags.writeable = False
+    return values
+
+
+def random_values(seed, first, n_frames, distribution="uniform", stream=0):
+    """
+        Values of the frames `first` to `first + n_frames` of a random stream
+    :param seed: the seed of the noise
+    :param first: absolute index of the first frame
+    :param n_frames: number of frames
+    :param distribution: "uniform" (in [-1, 1)) or "normal" (standard normal law)
+    :param stream: index of an independent stream for the same seed
+    :return: a numpy array of `n_frames` values
+    """
+    assert distribution in DISTRIBUTIONS, f"random_values, distribution shall be one of {DISTRIBUTIONS}"
+    if n_frames <= 0:
+        return np.zeros(0)
+
+    first_page = first // PAGE_SIZE
+    last_page = (first + n_frames - 1) // PAGE_SIZE
+    data = np.concatenate([page_values(seed, stream, page, distribution)
+                           for page in range(first_page, last_page + 1)])
+    start = first - first_page * PAGE_SIZE
+    return data[start:start + n_frames]
+
+
+def voss_values(seed, first, n_frames, weights):
+    """
+        Voss-McCartney colored noise : the k-th row holds a uniform random value for 2 ** k frames
+        With equal weights the spectrum falls as 1/f (pink), with weights 2 ** (k / 2) it falls as 1/f^2 (brown)
+        The result is divided by the sum of the weights so it stays within [-1, 1]
+    """
+    result = np.zeros(n_frames)
+    if n_frames <= 0:
+        return result
+
+    indexes = first + np.arange(n_frames, dtype=np.int64)
+    for row, weight in enumerate(weights):
+        row_indexes = indexes >> row
+        row_first = int(row_indexes[0])
+        values = random_values(seed, row_first, int(row_indexes[-1]) - row_first + 1, "uniform", stream=row + 1)
+        result += weight * values[row_indexes - row_first]
+    return result / sum(weights)
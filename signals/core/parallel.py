@@ -0,0 +1,75 @@
+"""
+    Render a signal over contiguous segments of a time sample in a pool of processes
+    The signal is sent once to each worker, in its compact binary form (see the `serialization` module) or pickled
+    when it can't be serialized, so it must not hold lambdas or other unpicklable objects.
+    On platforms spawning the worker processes (Windows, macOS) the rendering code must be guarded by
+    `if __name__ == '__main__':`
+    The graphs holding filters which depend on their whole past (IIR filters) are rendered in the current process,
+    as each worker would have to filter the input from t=0 up to its segment.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import serialization
+from .support import sample_supported
+
+# the signal rendered by the worker process
+worker_signal = None
+
+
+def load_signal(payload):
+    global worker_signal
+    worker_signal = serialization.from_bytes(payload) if isinstance(payload, bytes) else payload
+
+
+def render_segment(time_sample):
+    return sample_supported(worker_signal, time_sample)
+
+
+def depends_on_whole_past(signal, frame_width):
+    """True if the graph holds a Filter depending on its whole past (see `Filter.history`)"""
+    from .Filter import Filter
+    from .Profiler import child_signals
+
+    seen, stack = set(), [signal]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, Filter) and node.history(frame_width) is None:
+            return True
+        stack.extend(child_signals(node))
+    return False
+
+
+def parallel_sample_array(signal, time_sample, workers: int = None, segments: int = None):
+    """
+        Equivalent to `signal.sample_array(time_sample)` with the rendering split across processes
+    :param signal: the signal to render
+    :param time_sample: the TimeSample to render the signal on
+    :param workers: the number of processes, by default the number of cpus
+    :param segments: the number of segments, by default the number of workers
+    :return: the values of the signal as a numpy array
+    """
+    workers = workers or os.cpu_count() or 1
+    parts = time_sample.split(segments or workers)
+
+    if not parts:
+        return np.zeros(0)
+
+    if depends_on_whole_past(signal, time_sample.frame_width):
+        return sample_supported(signal, time_sample)
+
+    try:
+        payload = serialization.to_bytes(signal)
+    except serialization.NotSerializable:
+        payload = signal
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(parts)), initializer=load_signal,
+                             initargs=(payload,)) as pool:
+        results = list(pool.map(render_segment, parts))
+
+    return np.concatenate(results)
@@ -2,6 +2,7 @@
     Modified copy of playsound
     EDIT-1-WINDOWS -> the file wasn't closed after use leading to impossibility to remove the sound file
     TODO : make that modification on the other systems functions if necessary.
+    EDIT-2 -> `playsound_bytes` plays wave data held in memory, without writing it to the disk when possible
 """
 
 class PlaysoundException(Exception):
@@ -119,14 +120,69 @@ def _playsoundNix(sound, block=True):
     playbin.set_state(Gst.State.NULL)
 
 
+def _playsoundBytesWin(data, block = True):
+    """Play wave data held in memory with winsound (which can't play it asynchronously, hence the thread)"""
+    import winsound
+    from threading import Thread
+
+    def play():
+        winsound.PlaySound(bytes(data), winsound.SND_MEMORY)
+
+    if block:
+        play()
+    else:
+        Thread(target=play, daemon=True).start()
+
+def _playsoundBytesPipe(data, block = True):
+    """
+        Play wave data held in memory by piping it to a player reading from its standard input,
+        fall back on a temporary file (in the temporary directory of the system) when there is none
+    """
+    import os
+    import shutil
+    import subprocess
+    import tempfile
+    from threading import Thread
+
+    for command in (['aplay', '-q', '-'], ['paplay'], ['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', '-i', '-']):
+        if shutil.which(command[0]):
+            break
+    else:
+        command = None
+
+    def play():
+        if command:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE)
+            try:
+                process.stdin.write(data)
+            finally:
+                process.stdin.close()
+                process.wait()
+        else:
+            fd, path = tempfile.mkstemp(suffix='.wav')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(data)
+                playsound(path, block=True)
+            finally:
+                os.remove(path)
+
+    if block:
+        play()
+    else:
+        Thread(target=play, daemon=True).start()
+
 from platform import system
 system = system()
 
 if system == 'Windows':
     playsound = _playsoundWin
+    playsound_bytes = _playsoundBytesWin
 elif system == 'Darwin':
     playsound = _playsoundOSX
+    playsound_bytes = _playsoundBytesPipe
 else:
     playsound = _playsoundNix
+    playsound_bytes = _playsoundBytesPipe
 
 del system
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+    Declarative serialization of signal graphs, as JSON or as a compact binary
+    A signal is described by its class and its state (the attributes it holds), the state being made of numbers,
+    strings, lists, tuples, dicts, numpy arrays, other signals and named functions. Anonymous functions (lambdas)
+    can't be described : give the signals `NamedFunction`s instead, built from the functions of the registry.
+    The signals shared by several parents are written once. Loading gives back an identical graph.
+
+    Only the registered classes can be loaded : every Signal subclass is registered when it is defined,
+    other classes with `register_class`. The registered functions and classes must be the same for the loader.
+
+    The binary form is : MAGIC, the sizes of the header and the number of arrays, the zlib compressed JSON header,
+    then the raw bytes of each numpy array, preceded by their size.
+"""
+import base64
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from .OscillatorBank import OscillatorBank
+from .PhaseAccumulator import PhaseAccumulator
+from .RenderCache import state_of
+from .TimeSample import TimeSample
+from .wavefile import WaveData
+
+FORMAT_VERSION = 1
+MAGIC = b"SGNL"
+
+FUNCTIONS = {}
+CLASSES = {}
+
+
+class NotSerializable(Exception):
+    pass
+
+
+def register_function(name: str, function=None):
+    """
+        Register a function under a name, so that it can be used by `named` (usable as a decorator)
+        The function is called with the value (a number or a numpy array) and the params of the NamedFunction
+    """
+    if function is None:
+        return lambda function: register_function(name, function)
+    FUNCTIONS[name] = function
+    return function
+
+
+def register_class(cls, key: str = None):
+    """Allow the instances of the class to be serialized (the key defaults to the module and name of the class)"""
+    key = key or f"{cls.__module__}.{cls.__qualname__}"
+    CLASSES[key] = cls
+    cls._serialization_key = key
+    return cls
+
+
+class NamedFunction:
+    """
+        A registered function with its params, to use instead of a lambda wherever a function is expected
+        (`harmonics_amplitude_function`, `amplitude_function`, the parameters of FSine, ...)
+        It is described by its name and params : it can be serialized, pickled and hashed by the RenderCache.
+    """
+
+    def __init__(self, name: str, **params):
+        assert name in FUNCTIONS, f"NamedFunction.__init__, no function registered as {name!r}"
+        self.name = name
+        self.params = params
+
+    def __call__(self, value):
+        return FUNCTIONS[self.name](value, **self.params)
+
+    def __reduce__(self):
+        return named, (self.name,), self.params
+
+    def __setstate__(self, params):
+        self.params = params
+
+    def structure(self):
+        return dict(name=self.name, params=self.params)
+
+    def __eq__(self, other):
+        return isinstance(other, NamedFunction) and (self.name, self.params) == (other.name, other.params)
+
+    def __hash__(self):
+        return hash((self.name, tuple(sorted(self.params.items()))))
+
+    def __repr__(self):
+        return f"{self.name}({', '.join(f'{key}={value!r}' for key, value in self.params.items())})"
+
+
+def named(name: str, **params):
+    """Return the registered function `name` with the given params, ex: named("exponential", rate=-0.5)"""
+    return NamedFunction(name, **params)
+
+
+register_function("constant", lambda x, value=0.0: value + 0 * x)
+register_function("linear", lambda x, slope=1.0, intercept=0.0: slope * x + intercept)
+register_function("exponential", lambda x, rate=-1.0, scale=1.0: scale * np.exp(rate * x))
+register_function("power", lambda x, exponent=-1.0, scale=1.0: scale * np.power(x, exponent, dtype=float))
+register_function("sine", lambda x, frequency=1.0, amplitude=1.0, phase=0.0:
+                  amplitude * np.sin(2 * np.pi * frequency * x + phase))
+
+
+for cls in (TimeSample, PhaseAccumulator, OscillatorBank, WaveData):
+    register_class(cls)
+
+
+def set_state(value, state):
+    if hasattr(value, '__setstate__'):
+        value.__setstate__(state)
+    else:
+        vars(value).update(state)
+
+
+class Encoder:
+    """Turn a graph into a JSON compatible tree, the arrays being inlined in base64 or kept aside (binary form)"""
+
+    def __init__(self, binary: bool = False):
+        self.binary = binary
+        self.arrays = []
+        self.refs = {}
+
+    def encode(self, value):
+        # before the python types, np.float64 being a float
+        if isinstance(value, np.generic):
+            return {"__scalar__": self.encode(value.item()), "dtype": value.dtype.str}
+
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+
+        if isinstance(value, complex):
+            return {"__complex__": [value.real, value.imag]}
+
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+
+        if isinstance(value, tuple):
+            return {"__tuple__": [self.encode(item) for item in value]}
+
+        if isinstance(value, dict):
+            if all(isinstance(key, str) and not key.startswith("__") for key in value):
+                return {key: self.encode(item) for key, item in value.items()}
+            return {"__items__": [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+
+        if isinstance(value, np.ndarray):
+            value = np.ascontiguousarray(value)
+            result = {"dtype": value.dtype.str, "shape": list(value.shape)}
+            if self.binary:
+                result["__ndarray__"] = len(self.arrays)
+                self.arrays.append(value)
+            else:
+                result["__ndarray__"] = base64.b64encode(value.tobytes()).decode('ascii')
+            return result
+
+        if isinstance(value, NamedFunction):
+            return {"__function__": value.name, "params": self.encode(value.params)}
+
+        if id(value) in self.refs:
+            return {"__ref__": self.refs[id(value)]}
+
+        # looked up on the class itself, so that the subclasses which aren't registered are refused
+        key = vars(type(value)).get('_serialization_key')
+        if key is None or CLASSES.get(key) is not type(value):
+            if callable(value):
+                raise NotSerializable(f"{value!r} can't be serialized, use a NamedFunction instead "
+                                      f"(see `register_function` and `named`)")
+            raise NotSerializable(f"{type(value).__qualname__} objects can't be serialized, see `register_class`")
+
+        self.refs[id(value)] = ref = len(self.refs)
+        return {"__object__": key, "ref": ref, "state": self.encode(state_of(value))}
+
+
+class Decoder:
+    def __init__(self, arrays=None):
+        self.arrays = arrays
+        self.refs = {}
+
+    def decode(self, value):
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+
+        if not isinstance(value, dict):
+            return value
+
+        if "__tuple__" in value:
+            return tuple(self.decode(item) for item in value["__tuple__"])
+
+        if "__items__" in value:
+            return {self.decode(key): self.decode(item) for key, item in value["__items__"]}
+
+        if "__scalar__" in value:
+            return np.dtype(value["dtype"]).type(self.decode(value["__scalar__"]))
+
+        if "__complex__" in value:
+            return complex(*value["__complex__"])
+
+        if "__ndarray__" in value:
+            data = value["__ndarray__"]
+            data = self.arrays[data] if isinstance(data, int) else base64.b64decode(data)
+            return np.frombuffer(data, dtype=value["dtype"]).reshape(value["shape"]).copy()
+
+        if "__function__" in value:
+            return named(value["__function__"], **self.decode(value["params"]))
+
+        if "__ref__" in value:
+            return self.refs[value["__ref__"]]
+
+        if "__object__" in value:
+            if value["__object__"] not in CLASSES:
+                raise NotSerializable(f"{value['__object__']} is not a registered class")
+            cls = CLASSES[value["__object__"]]
+            result = cls.__new__(cls)
+            self.refs[value["ref"]] = result
+            set_state(result, self.decode(value["state"]))
+            return result
+
+        return {key: self.decode(item) for key, item in value.items()}
+
+
+def to_tree(signal, binary=False):
+    encoder = Encoder(binary=binary)
+    tree = {"format": "signals", "version": FORMAT_VERSION, "signal": encoder.encode(signal)}
+    return tree, encoder.arrays
+
+
+def from_tree(tree, arrays=None):
+    if tree.get("format") != "signals" or tree.get("version") != FORMAT_VERSION:
+        raise NotSerializable(f"Unsupported serialization format : {tree.get('format')} {tree.get('version')}")
+    return Decoder(arrays).decode(tree["signal"])
+
+
+def to_json(signal, **config):
+    """Return the JSON description of the signal (the config is passed to `json.dumps`)"""
+    return json.dumps(to_tree(signal)[0], **config)
+
+
+def from_json(text):
+    return from_tree(json.loads(text))
+
+
+def to_bytes(signal):
+    """Return the compact binary description of the signal"""
+    tree, arrays = to_tree(signal, binary=True)
+    header = zlib.compress(json.dumps(tree, separators=(',', ':')).encode('utf-8'))
+    parts = [MAGIC, struct.pack('<II', len(header), len(arrays)), header]
+    for array in arrays:
+        parts.append(struct.pack('<Q', array.nbytes))
+        parts.append(array.tobytes())
+    return b"".join(parts)
+
+
+def from_bytes(data):
+    data = memoryview(data)
+    if bytes(data[:4]) != MAGIC:
+        raise NotSerializable("from_bytes, the data is not a serialized signal")
+    header_size, n_arrays = struct.unpack('<II', data[4:12])
+    position = 12 + header_size
+    tree = json.loads(zlib.decompress(data[12:position]).decode('utf-8'))
+
+    arrays = []
+    for _ in range(n_arrays):
+        size, = struct.unpack('<Q', data[position:position + 8])
+        position += 8
+        arrays.append(data[position:position + size])
+        position += size
+    return from_tree(tree, arrays)
@@ -0,0 +1,118 @@
+"""
+    Audio sinks for the real-time Player
+    A sink is opened with the frame rate, receives float blocks (in [-1, 1]) through `write` and is finally closed.
+"""
+import shutil
+import subprocess
+import time
+
+import numpy as np
+
+from .wavefile import encode_frames
+
+try:
+    import sounddevice
+except ImportError:
+    sounddevice = None
+
+
+class Sink:
+    def open(self, frame_rate: float):
+        pass
+
+    def write(self, block):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class NullSink(Sink):
+    """
+        Sink discarding the audio, for tests and benchmarks
+        With `realtime=True` each write lasts as long as the block would take to play
+    """
+
+    def __init__(self, realtime: bool = False, keep: bool = False):
+        """
+        :param realtime: if True, `write` waits for the duration of the block, like an audio device would
+        :param keep: if True, the received blocks are kept in `blocks`
+        """
+        self.realtime = realtime
+        self.keep = keep
+        self.frame_rate = None
+        self.frames = 0
+        self.blocks = []
+
+    def open(self, frame_rate: float):
+        self.frame_rate = frame_rate
+
+    def write(self, block):
+        self.frames += len(block)
+        if self.keep:
+            self.blocks.append(np.array(block))
+        if self.realtime:
+            time.sleep(len(block) / self.frame_rate)
+
+
+class PipeSink(Sink):
+    """
+        Sink writing raw 16 bits little-endian PCM to the standard input of an external player
+        By default `aplay` or `paplay` is used, whichever is found first
+    """
+
+    def __init__(self, command: list = None):
+        """
+        :param command: the command of the player, where "{rate}" is replaced by the frame rate
+        """
+        self.command = command
+        self.process = None
+
+    @staticmethod
+    def default_command():
+        if shutil.which('aplay'):
+            return ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', '{rate}']
+        if shutil.which('paplay'):
+            return ['paplay', '--raw', '--format=s16le', '--channels=1', '--rate={rate}']
+        raise Exception("PipeSink, no player found : install `aplay` or `paplay`, or give the player command")
+
+    def open(self, frame_rate: float):
+        command = self.command or self.default_command()
+        command = [part.replace('{rate}', str(int(round(frame_rate)))) for part in command]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, block):
+        self.process.stdin.write(encode_frames(block, sampwidth=2))
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait()
+            self.process = None
+
+
+class DeviceSink(Sink):
+    """Sink playing the audio on a sound device, using the `sounddevice` package"""
+
+    def __init__(self, device=None):
+        """
+        :param device: the sound device (see `sounddevice.query_devices`), by default the default output device
+        """
+        if not sounddevice:
+            raise Exception(f"To use the DeviceSink you must install `sounddevice` using the command : "
+                            f"pip install sounddevice")
+        self.device = device
+        self.stream = None
+
+    def open(self, frame_rate: float):
+        self.stream = sounddevice.OutputStream(samplerate=frame_rate, channels=1, dtype='float32', device=self.device)
+        self.stream.start()
+
+    def write(self, block):
+        self.stream.write(np.clip(block, -1.0, 1.0).astype(np.float32).reshape(-1, 1))
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
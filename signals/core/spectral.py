@@ -0,0 +1,111 @@
+"""
+    Spectral analysis of samples with real FFTs
+    The short-time transforms are computed `chunk` windows at a time, so the memory only depends on the window size
+    and the chunk, not on the length of the sample (memory mapped samples are never loaded as a whole).
+    The magnitudes are scaled so that a sine of amplitude A gives a peak of A.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+WINDOWS = ("hann", "hamming", "blackman", "rectangular")
+
+
+def window_values(window, size):
+    """The values of a window given by name (periodic version) or as an array of `size` values"""
+    if not isinstance(window, str):
+        window = np.asarray(window, dtype=float)
+        assert window.shape == (size,), f"window_values, the window shall have {size} values"
+        return window
+
+    assert window in WINDOWS, f"window_values, the window shall be one of {WINDOWS} or an array"
+    if window == "rectangular":
+        return np.ones(size)
+    return {"hann": np.hanning, "hamming": np.hamming, "blackman": np.blackman}[window](size + 1)[:-1]
+
+
+def mono(data):
+    """Mix the channels of 2D data down to one"""
+    data = np.asarray(data, dtype=float)
+    return data.mean(axis=1) if data.ndim == 2 else data
+
+
+def i_stft(data, size=2048, hop=512, window="hann", chunk=256):
+    """
+        Yield the short-time Fourier transform of the data by chunks of windows
+    :param data: the samples, 1D or 2D of shape (n_frames, n_channels) (mixed down to mono)
+    :param size: the number of frames of a window (and of the FFT)
+    :param hop: the number of frames between the starts of two consecutive windows
+    :param window: the name of the window (see WINDOWS) or its values
+    :param chunk: the maximum number of windows transformed at once
+    :return: (starts, spectra) pairs, the frame index of the start of each window and the complex spectra,
+        an array of shape (len(starts), size // 2 + 1)
+    """
+    assert size > 0 and hop > 0 and chunk > 0
+    values = window_values(window, size)
+
+    n_windows = 1 + max(len(data) - size, 0) // hop
+    for first in range(0, n_windows, chunk):
+        count = min(chunk, n_windows - first)
+        start = first * hop
+        block = mono(data[start:start + (count - 1) * hop + size])
+        if len(block) < size:
+            # a sample shorter than a window gives one zero padded window
+            block = np.concatenate([block, np.zeros(size - len(block))])
+        frames = sliding_window_view(block, size)[::hop]
+        yield start + np.arange(count) * hop, np.fft.rfft(frames * values, axis=1)
+
+
+def stft(data, size=2048, hop=512, window="hann", chunk=256):
+    """The complete short-time Fourier transform (see `i_stft`) : the starts of the windows and the spectra"""
+    starts, spectra = [], []
+    for chunk_starts, chunk_spectra in i_stft(data, size, hop, window, chunk):
+        starts.append(chunk_starts)
+        spectra.append(chunk_spectra)
+    if not starts:
+        return np.zeros(0, dtype=int), np.zeros((0, size // 2 + 1), dtype=complex)
+    return np.concatenate(starts), np.concatenate(spectra)
+
+
+def amplitude_scale(values, size):
+    """Factors turning the absolute values of the bins of a windowed FFT into amplitudes"""
+    scale = np.full(size // 2 + 1, 2 / np.sum(values))
+    scale[0] /= 2
+    if size % 2 == 0:
+        scale[-1] /= 2
+    return scale
+
+
+def spectrum(data, size=8192, hop=None, window="hann", chunk=64):
+    """
+        The amplitude spectrum of the data averaged over its windows (Welch's method)
+    :param size: the number of frames of a window, which sets the resolution (frame_rate / size Hz)
+    :param hop: the number of frames between two windows, by default half of the size
+    :return: the amplitude of each of the `size // 2 + 1` bins
+    """
+    values = window_values(window, size)
+    power = np.zeros(size // 2 + 1)
+    count = 0
+    for _, spectra in i_stft(data, size, hop or max(1, size // 2), values, chunk):
+        power += np.sum(np.abs(spectra) ** 2, axis=0)
+        count += len(spectra)
+    return np.sqrt(power / max(count, 1)) * amplitude_scale(values, size)
+
+
+def spectrogram(data, size=2048, hop=512, window="hann", chunk=256, db=False):
+    """
+        The amplitudes of the short-time Fourier transform as a float32 array of shape (n_windows, size // 2 + 1)
+    :param db: if True the amplitudes are given in decibels (relative to an amplitude of 1, floored at -200dB)
+    :return: the starts of the windows and the amplitudes
+    """
+    values = window_values(window, size)
+    scale = amplitude_scale(values, size)
+    starts, rows = [], []
+    for chunk_starts, spectra in i_stft(data, size, hop, values, chunk):
+        amplitudes = np.abs(spectra) * scale
+        if db:
+            amplitudes = 20 * np.log10(np.maximum(amplitudes, 1e-10))
+        starts.append(chunk_starts)
+        rows.append(amplitudes.astype(np.float32))
+    if not starts:
+        return np.zeros(0, dtype=int), np.zeros((0, size // 2 + 1), dtype=np.float32)
+    return np.concatenate(starts), np.concatenate(rows)
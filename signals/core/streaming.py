@@ -0,0 +1,73 @@
+"""
+    Block by block rendering of signals straight to a wave file, memory use only depends on the block size
+"""
+import numpy as np
+
+from .wavefile import WaveWriter, peak
+
+NORM_MODES = ("prepass", "limiter")
+
+
+class BlockLimiter:
+    """
+        Block-wise limiter, for the renders whose peak isn't known in advance
+        The gain starts at `gain` and is only ever lowered, when a block would exceed `norm_to`. In such a block the gain
+        ramps down from its previous value to the new one, reached at the first frame which would have exceeded
+        `norm_to`, so the gain doesn't jump at the block boundaries and fade-ins keep their shape.
+        Quiet renders are not amplified : the peak of the output is at most `norm_to`.
+    """
+
+    def __init__(self, norm_to: float, gain: float = 1.0):
+        self.norm_to = norm_to
+        self.gain = gain
+
+    def __call__(self, block):
+        """Return the gain to apply to the block, a number or one gain per frame when the gain is lowered"""
+        amplitudes = np.abs(block)
+        if not len(block) or np.max(amplitudes) * self.gain <= self.norm_to:
+            return self.gain
+
+        target = self.norm_to / np.max(amplitudes)
+        first = int(np.argmax(amplitudes * self.gain > self.norm_to))
+        gains = np.full(len(block), target)
+        gains[:first] = np.linspace(self.gain, target, first + 1)[:-1]
+        self.gain = target
+        return gains
+
+
+def estimate_peak(signal, time_sample, block_size=2048):
+    """Render the signal block by block keeping only the maximum absolute value"""
+    return max((peak(block) for block in signal.i_sample_blocks(time_sample, block_size)), default=0.0)
+
+
+def stream_to_wave(signal, time_sample, filepath, norm_to=None, norm_mode="prepass",
+                   sampwidth=2, block_size=2048, float_pcm=False):
+    """
+        Render the signal over the time sample and write each block to the wave file as soon as it is computed
+    :param signal: the signal to render
+    :param time_sample: the TimeSample to render the signal on
+    :param filepath: the path of the wave file, or a binary file object opened for writing
+    :param norm_to: if given, the output is scaled so that its peak amplitude equals `norm_to`
+    :param norm_mode: how `norm_to` is honoured
+        - "prepass" renders the signal a first time only to measure its peak (twice the cpu, no memory)
+        - "limiter" lowers the gain on the fly with a BlockLimiter (single pass, the peak is at most `norm_to`
+        but quieter renders are not amplified)
+    :param sampwidth: the number of bytes per sample
+    :param block_size: the number of frames rendered and written at once
+    :param float_pcm: if True the samples are written as 32 bits floats (requires sampwidth=4)
+    """
+    assert norm_mode in NORM_MODES, f"stream_to_wave, norm_mode shall be one of {NORM_MODES}"
+
+    if norm_to is None:
+        gain_for = None
+    elif norm_mode == "prepass":
+        amplitude_max = estimate_peak(signal, time_sample, block_size)
+        gain = norm_to / amplitude_max if amplitude_max else 1.0
+        gain_for = lambda block: gain
+    else:
+        gain_for = BlockLimiter(norm_to)
+
+    with WaveWriter(filepath, nchannels=1, sampwidth=sampwidth, framerate=time_sample.frame_rate,
+                    nframes=len(time_sample), float_pcm=float_pcm) as file:
+        for block in signal.i_sample_blocks(time_sample, block_size):
+            file.write(block * gain_for(block) if gain_for else block)
@@ -0,0 +1,121 @@
+"""
+    Time supports of the signals
+    The support of a signal is a sorted list of disjoint [start, end) intervals (in seconds) out of which the signal is 0,
+    or None when the signal may be non zero at any time. Renderers only sample the signals inside their support.
+    Renderers ask for the part of the support overlapping the block they render (see `support_between`),
+    which the signals made of many intervals (scores, sums of notes, ...) can give without building their whole support.
+"""
+import numpy as np
+
+
+def normalize(intervals):
+    """Sort the intervals, drop the empty ones and merge the overlapping ones"""
+    result = []
+    for start, end in sorted((start, end) for start, end in intervals if start < end):
+        if result and start <= result[-1][1]:
+            result[-1] = (result[-1][0], max(result[-1][1], end))
+        else:
+            result.append((start, end))
+    return result
+
+
+def union(*supports):
+    """The support of a sum : the union of the supports (None if any of them is None)"""
+    if any(support is None for support in supports):
+        return None
+    return normalize(interval for support in supports for interval in support)
+
+
+def intersection(*supports):
+    """The support of a product : the intersection of the supports (the None supports are ignored)"""
+    supports = [support for support in supports if support is not None]
+    if not supports:
+        return None
+
+    result, *others = supports
+    for support in others:
+        merged = []
+        i, j = 0, 0
+        while i < len(result) and j < len(support):
+            start, end = max(result[i][0], support[j][0]), min(result[i][1], support[j][1])
+            if start < end:
+                merged.append((start, end))
+            if result[i][1] < support[j][1]:
+                i += 1
+            else:
+                j += 1
+        result = merged
+    return result
+
+
+def bisect_bound(support, t, bound):
+    """The number of intervals whose `bound` (0 for the start, 1 for the end) is at most t, found by bisection"""
+    low, high = 0, len(support)
+    while low < high:
+        middle = (low + high) // 2
+        if t < support[middle][bound]:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def overlapping(support, t_min, t_max):
+    """The intervals of the support overlapping [t_min, t_max] (found by bisection), None if the support is None"""
+    if support is None:
+        return None
+    # both the starts and the ends are sorted, the intervals being disjoint
+    return support[bisect_bound(support, t_min, 1):bisect_bound(support, t_max, 0)]
+
+
+def support_of(value):
+    """The support of a signal, None for the values (callables, constants, ...) without one"""
+    return getattr(value, 'support', None)
+
+
+def support_between(value, t_min, t_max):
+    """
+        The intervals of the support of a signal overlapping [t_min, t_max], None for the values without support
+        Signals can define a `support_between(t_min, t_max)` method giving them without building their whole support
+    """
+    method = getattr(value, 'support_between', None)
+    if method is not None:
+        return method(t_min, t_max)
+    return overlapping(support_of(value), t_min, t_max)
+
+
+def support_frames(support, time_sample):
+    """Return the (start, stop) ranges of the frames of the time sample lying in the support"""
+    if support is None:
+        return [(0, len(time_sample))]
+    if not len(time_sample):
+        return []
+
+    times = time_sample.to_array()
+    ranges = []
+    for start, end in overlapping(support, times[0], times[-1]):
+        i_start, i_stop = np.searchsorted(times, [start, end])
+        if i_start < i_stop:
+            ranges.append((int(i_start), int(i_stop)))
+    return ranges
+
+
+def sample_supported(signal, time_sample, sample=None):
+    """
+        Same as `signal.sample_array(time_sample)` but the signal is only sampled in its support, the rest is 0
+    :param sample: the function sampling the signal over a time sample, by default `signal.sample_array`
+    """
+    sample = sample or signal.sample_array
+    if not len(time_sample):
+        return sample(time_sample)
+
+    times = time_sample.to_array()
+    ranges = support_frames(support_between(signal, times[0], times[-1]), time_sample)
+
+    if ranges == [(0, len(time_sample))]:
+        return sample(time_sample)
+
+    result = np.zeros(len(time_sample))
+    for start, stop in ranges:
+        result[start:stop] = sample(time_sample.segment(start, stop))
+    return result
@@ -1,5 +1,9 @@
 import itertools
-from math import cos, sin, tau
+from fractions import Fraction
+from functools import reduce
+from math import cos, sin, tau, inf
+
+import numpy as np
 
 
 def grouper(n, iterable, fillvalue=None):
@@ -13,6 +17,85 @@ def trig(frequency, time, amplitude=1.0, phase=0.0):
     return amplitude * cos(x), amplitude * sin(x)
 
 
+def sample_function(function, time_sample):
+    """
+        Sample any function of time as a numpy array
+        Signals (or any object providing `sample_array`) are sampled natively, other callables are called once per frame
+    """
+    if hasattr(function, 'sample_array'):
+        return function.sample_array(time_sample)
+    else:
+        return np.fromiter(map(function, time_sample), dtype=float, count=len(time_sample))
+
+
+def sample_parameter(value, time_sample):
+    """
+        Sample a parameter which can be a constant, a signal or a callable of time
+        Constants are returned as they are. Callables are first called once with the array of times
+        and, if they refuse it (TypeError or ValueError, as the functions of `math` or the tests on the time do)
+        or don't give one value per frame, called once per frame. Other errors are raised.
+    """
+    if hasattr(value, 'sample_array'):
+        return value.sample_array(time_sample)
+
+    if callable(value):
+        times = time_sample.to_array()
+        try:
+            result = value(times)
+        except (TypeError, ValueError):
+            result = None
+        if isinstance(result, np.ndarray) and result.shape == times.shape:
+            return result.astype(float, copy=False)
+        return sample_function(value, time_sample)
+
+    return value
+
+
+INTERPOLATIONS = ("linear", "cubic")
+
+
+def interpolate_points(y0, y1, y2, y3, x, interpolation="cubic"):
+    """Interpolate between y1 (x=0) and y2 (x=1), using y0 (x=-1) and y3 (x=2) for the cubic (4 points Lagrange)"""
+    if interpolation == "linear":
+        return y1 + x * (y2 - y1)
+    c1 = y2 - y0 / 3 - y1 / 2 - y3 / 6
+    c2 = (y0 + y2) / 2 - y1
+    c3 = (y3 - y0) / 6 + (y1 - y2) / 2
+    return ((c3 * x + c2) * x + c1) * x + y1
+
+
+def interpolate_periodic(table, positions, interpolation="cubic"):
+    """
+        Read a periodic table at fractional positions
+    :param table: one period of a signal as a numpy array
+    :param positions: the (fractional) indexes to read, taken modulo the size of the table
+    :param interpolation: "linear" or "cubic" (4 points Lagrange)
+    :return: the interpolated values as a numpy array
+    """
+    assert interpolation in INTERPOLATIONS, f"interpolation shall be one of {INTERPOLATIONS}"
+    size = len(table)
+    positions = np.mod(positions, size)
+    index = np.floor(positions).astype(np.intp)
+    return interpolate_points(table[(index - 1) % size], table[index % size], table[(index + 1) % size],
+                              table[(index + 2) % size], positions - index, interpolation)
+
+
+def interpolate(values, positions, interpolation="cubic"):
+    """
+        Read values at fractional positions, the values are 0 outside of the array
+    :param values: a numpy array
+    :param positions: the (fractional) indexes to read
+    :param interpolation: "linear" or "cubic" (4 points Lagrange)
+    :return: the interpolated values as a numpy array
+    """
+    assert interpolation in INTERPOLATIONS, f"interpolation shall be one of {INTERPOLATIONS}"
+    padded = np.concatenate([np.zeros(2), values, np.zeros(3)])
+    index = np.floor(positions).astype(np.intp)
+    x = positions - index
+    index = np.clip(index, -2, len(values)) + 2
+    return interpolate_points(padded[index - 1], padded[index], padded[index + 1], padded[index + 2], x, interpolation)
+
+
 class MathUtils:
     @staticmethod
     def pgcd2(a, b):
@@ -37,16 +120,19 @@ class MathUtils:
             return (a * b) // cls.pgcd2(a, b)
 
     @classmethod
-    def ppcm(cls, *n):
-        """Calcul du 'Plus Petit Commun Multiple' de n (>=2) valeurs entières (Euclide)"""
-
-        if any(isinstance(k, float) for k in n):
-            N = 10 ** max(len(k.split('.')[1]) if '.' in k else 0 for k in map(str, n))
-            n = tuple(int(N * k) for k in n)
-        else:
-            N = 1
+    def ppcm(cls, *n, max_denominator: int = 10 ** 6):
+        """
+            Calcul du 'Plus Petit Commun Multiple' de n valeurs entières ou décimales
+            Chaque valeur est approchée par la fraction la plus proche de dénominateur <= `max_denominator`,
+            le résultat vaut 0 si une des valeurs est nulle et `inf` s'il dépasse la précision des flottants
+        """
+        fractions = [abs(Fraction(k).limit_denominator(max_denominator)) for k in n]
+        if not fractions or 0 in fractions:
+            return 0
 
-        p = abs(n[0] * n[1]) // cls.pgcd2(n[0], n[1])
-        for x in n[2:]:
-            p = abs(p * x) // cls.pgcd2(p, x)
-        return p / N
+        numerator = reduce(cls.ppcm2, (fraction.numerator for fraction in fractions))
+        denominator = reduce(cls.pgcd2, (fraction.denominator for fraction in fractions))
+        try:
+            return numerator / denominator
+        except OverflowError:
+            return inf
@@ -0,0 +1,328 @@
+"""
+    Minimal RIFF/WAVE writer and reader built on numpy
+    It supports integer PCM (8, 16, 24 and 32 bits) and 32 bits float PCM, which the standard `wave` module can't write
+    Wave files are read through a memory map : nothing is loaded until the frames are accessed
+"""
+import os
+import struct
+
+import numpy as np
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+INTEGER_SAMPWIDTHS = (1, 2, 3, 4)
+
+
+def check_format(sampwidth, float_pcm=False):
+    if float_pcm:
+        assert sampwidth == 4, f"Float PCM is only supported with sampwidth=4, not {sampwidth}"
+    else:
+        assert sampwidth in INTEGER_SAMPWIDTHS, \
+            f"Integer PCM is only supported with sampwidth in {INTEGER_SAMPWIDTHS}, not {sampwidth}"
+
+
+def peak(data):
+    """Return the maximum absolute value of the data (0 for empty data)"""
+    return float(np.max(np.abs(data))) if len(data) else 0.0
+
+
+def max_amplitude(sampwidth):
+    """The integer value the amplitude 1.0 is encoded to"""
+    return float(2 ** (sampwidth * 8 - 1) - 1)
+
+
+def encode_frames(data, sampwidth=2, float_pcm=False, gain=1.0):
+    """
+        Convert float samples into little-endian PCM bytes
+    :param data: float samples, either 1D (mono) or 2D of shape (n_frames, n_channels)
+    :param sampwidth: the number of bytes per sample
+    :param float_pcm: if True the data is written as 32 bits floats (not clipped), else as integers clipped to [-1, 1]
+    :param gain: a factor applied to the data before conversion
+    :return: the interleaved frames as bytes
+    """
+    check_format(sampwidth, float_pcm)
+    data = np.asarray(data, dtype=float)
+    if gain != 1.0:
+        data = data * gain
+
+    if float_pcm:
+        return data.astype('<f4').tobytes()
+
+    data = np.clip(data, -1.0, 1.0) * max_amplitude(sampwidth)
+
+    if sampwidth == 1:
+        # 8 bits wave files are unsigned
+        return (data + 128).astype(np.uint8).tobytes()
+    elif sampwidth == 2:
+        return data.astype('<i2').tobytes()
+    elif sampwidth == 3:
+        return data.astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    else:
+        return data.astype('<i4').tobytes()
+
+
+class WaveWriter:
+    """
+        Write a wave file frames block by block
+        The header is written with the expected number of frames and patched on close if it turns out to be different
+    """
+
+    def __init__(self, file, nchannels=1, sampwidth=2, framerate=44100, nframes=0, float_pcm=False):
+        """
+        :param file: a filepath or a binary file object opened for writing
+        :param nchannels: the number of channels
+        :param sampwidth: the number of bytes per sample
+        :param framerate: the number of frames per second
+        :param nframes: the expected number of frames
+        :param float_pcm: if True the samples are 32 bits floats, else integers
+        """
+        check_format(sampwidth, float_pcm)
+        assert nchannels > 0
+
+        if isinstance(file, (str, os.PathLike)):
+            self.file = open(file, 'wb')
+            self.owns_file = True
+        else:
+            self.file = file
+            self.owns_file = False
+
+        self.nchannels = nchannels
+        self.sampwidth = sampwidth
+        self.framerate = int(round(framerate))
+        self.float_pcm = float_pcm
+        self.declared_nframes = nframes
+        self.nframes = 0
+
+        self.seekable = getattr(self.file, 'seekable', lambda: False)()
+        self.header_start = self.file.tell() if self.seekable else 0
+        self.write_header(nframes)
+
+    @property
+    def frame_size(self):
+        return self.nchannels * self.sampwidth
+
+    def write_header(self, nframes):
+        data_size = nframes * self.frame_size
+        format_tag = WAVE_FORMAT_IEEE_FLOAT if self.float_pcm else WAVE_FORMAT_PCM
+
+        fmt = struct.pack('<HHIIHH', format_tag, self.nchannels, self.framerate,
+                          self.framerate * self.frame_size, self.frame_size, self.sampwidth * 8)
+        chunks = b''
+        if self.float_pcm:
+            # non PCM formats require the `cbSize` field and a `fact` chunk
+            fmt += struct.pack('<H', 0)
+            chunks += b'fact' + struct.pack('<II', 4, nframes)
+
+        chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt + chunks
+        riff_size = 4 + len(chunks) + 8 + data_size + data_size % 2
+
+        self.file.write(b'RIFF' + struct.pack('<I', riff_size) + b'WAVE' + chunks +
+                        b'data' + struct.pack('<I', data_size))
+
+    def writeframes(self, frames: bytes):
+        """Write already encoded frames (see `encode_frames`)"""
+        self.file.write(frames)
+        self.nframes += len(frames) // self.frame_size
+
+    def write(self, data, gain=1.0):
+        """Encode and write float samples"""
+        self.writeframes(encode_frames(data, self.sampwidth, self.float_pcm, gain))
+
+    def close(self):
+        if self.file is None:
+            return
+
+        if (self.nframes * self.frame_size) % 2:
+            self.file.write(b'\x00')
+
+        if self.nframes != self.declared_nframes:
+            assert self.seekable, \
+                f"WaveWriter.close, {self.nframes} frames written instead of {self.declared_nframes} " \
+                f"and the file is not seekable"
+            end = self.file.tell()
+            self.file.seek(self.header_start)
+            self.write_header(self.nframes)
+            self.file.seek(end)
+
+        if hasattr(self.file, 'flush'):
+            self.file.flush()
+        if self.owns_file:
+            self.file.close()
+        self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def decode_frames(frames, sampwidth=2, float_pcm=False):
+    """
+        Convert raw frames (as stored by `WaveData`) into float samples, the inverse of `encode_frames`
+    :param frames: the raw frames, the 24 bits samples are given as an extra last axis of 3 bytes
+    :param sampwidth: the number of bytes per sample
+    :param float_pcm: if True the frames are 32 bits floats
+    :return: the samples as a float numpy array
+    """
+    if float_pcm:
+        return np.asarray(frames, dtype=float)
+
+    if sampwidth == 1:
+        frames = np.asarray(frames, dtype=float) - 128
+    elif sampwidth == 3:
+        frames = np.asarray(frames, dtype=np.uint8)
+        frames = frames[..., 0].astype('<i4') | (frames[..., 1].astype('<i4') << 8) | (frames[..., 2].astype('<i4') << 16)
+        frames = np.where(frames >= 1 << 23, frames - (1 << 24), frames)
+    return np.asarray(frames, dtype=float) / max_amplitude(sampwidth)
+
+
+def read_header(file):
+    """
+        Parse the chunks of a wave file up to its `data` chunk
+    :param file: a binary file object opened for reading, positioned at the start of the wave file
+    :return: a dict with the nchannels, sampwidth, framerate, float_pcm, nframes and the offset of the frames
+    """
+    start = file.tell()
+    riff, _, wave = struct.unpack('<4sI4s', file.read(12))
+    if riff != b'RIFF' or wave != b'WAVE':
+        raise Exception("read_header, the file is not a RIFF/WAVE file")
+
+    header = None
+    while True:
+        chunk = file.read(8)
+        if len(chunk) < 8:
+            raise Exception("read_header, no `data` chunk found")
+        name, size = struct.unpack('<4sI', chunk)
+
+        if name == b'fmt ':
+            fmt = file.read(size)
+            format_tag, nchannels, framerate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+            if format_tag == WAVE_FORMAT_EXTENSIBLE:
+                # the actual format is given by the first 2 bytes of the SubFormat GUID
+                format_tag, = struct.unpack('<H', fmt[24:26])
+            if format_tag not in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT):
+                raise Exception(f"read_header, unsupported wave format {format_tag:#06x}")
+            header = dict(nchannels=nchannels, sampwidth=bits // 8, framerate=framerate,
+                          float_pcm=format_tag == WAVE_FORMAT_IEEE_FLOAT)
+            check_format(header['sampwidth'], header['float_pcm'])
+            file.seek(size % 2, os.SEEK_CUR)
+
+        elif name == b'data':
+            if header is None:
+                raise Exception("read_header, the `data` chunk comes before the `fmt ` chunk")
+            header['offset'] = file.tell() - start
+            header['nframes'] = size // (header['nchannels'] * header['sampwidth'])
+            return header
+
+        else:
+            file.seek(size + size % 2, os.SEEK_CUR)
+
+
+class WaveData:
+    """
+        Frames of a wave file (or of any array) decoded to floats only when they are read
+        `frames` is the raw data, of shape (nframes, nchannels), usually a memory map of the file.
+    """
+
+    def __init__(self, frames, framerate, sampwidth=None, float_pcm=True):
+        """
+        :param frames: the raw frames, 1D (mono) or 2D of shape (nframes, nchannels)
+            24 bits samples have an extra last axis of 3 bytes
+        :param framerate: the number of frames per second
+        :param sampwidth: the number of bytes per sample, None if the frames already are floats
+        :param float_pcm: if True the frames are floats, else integers to decode
+        """
+        if np.ndim(frames) == 1 or (sampwidth == 3 and np.ndim(frames) == 2):
+            frames = frames.reshape(len(frames), 1, *frames.shape[1:])
+        self.frames = frames
+        self.framerate = framerate
+        self.sampwidth = sampwidth
+        self.float_pcm = float_pcm
+        self.filepath = None
+
+    @classmethod
+    def from_file(cls, filepath):
+        """Memory map the frames of a wave file"""
+        with open(filepath, 'rb') as file:
+            header = read_header(file)
+
+        nchannels, sampwidth = header['nchannels'], header['sampwidth']
+        if header['float_pcm']:
+            dtype = '<f4'
+        else:
+            dtype = {1: np.uint8, 2: '<i2', 3: np.uint8, 4: '<i4'}[sampwidth]
+        shape = (header['nframes'], nchannels, 3) if sampwidth == 3 else (header['nframes'], nchannels)
+
+        if header['nframes']:
+            frames = np.memmap(filepath, dtype=dtype, mode='r', offset=header['offset'], shape=shape)
+        else:
+            frames = np.zeros(shape, dtype=dtype)
+        data = cls(frames, header['framerate'], sampwidth, header['float_pcm'])
+        data.filepath = os.fspath(filepath)
+        return data
+
+    def structure(self):
+        """Describe a mapped file by its path and modification time rather than by its content (see RenderCache)"""
+        if self.filepath is None:
+            return dict(frames=self.frames, framerate=self.framerate, sampwidth=self.sampwidth, float_pcm=self.float_pcm)
+        stat = os.stat(self.filepath)
+        return dict(filepath=os.path.abspath(self.filepath), mtime=stat.st_mtime_ns, size=stat.st_size)
+
+    def __getstate__(self):
+        # a mapped file is mapped again when unpickled (by the worker processes) instead of being copied
+        state = dict(vars(self))
+        if self.filepath is not None:
+            state['frames'] = None
+        return state
+
+    def __setstate__(self, state):
+        vars(self).update(state)
+        if self.filepath is not None:
+            self.frames = WaveData.from_file(self.filepath).frames
+
+    @property
+    def nchannels(self):
+        return self.frames.shape[1]
+
+    @property
+    def duration(self):
+        return len(self) / self.framerate
+
+    def __len__(self):
+        return len(self.frames)
+
+    def decode(self, frames):
+        if self.sampwidth is None:
+            return np.asarray(frames, dtype=float)
+        return decode_frames(frames, self.sampwidth, self.float_pcm)
+
+    def read(self, start, stop, channel=None):
+        """
+            Decode the frames in [start, stop), the frames outside of the data are 0
+        :param start: the index of the first frame
+        :param stop: the index after the last frame
+        :param channel: the channel to read, by default the mean of all the channels
+        :return: the samples as a 1D float numpy array of length `stop - start`
+        """
+        result = np.zeros(max(stop - start, 0))
+        first, last = max(start, 0), min(stop, len(self))
+        if first < last:
+            frames = self.frames[first:last] if channel is None else self.frames[first:last, channel:channel + 1]
+            result[first - start:last - start] = self.decode(frames).mean(axis=1)
+        return result
+
+    def to_array(self, channel=None):
+        """
+            All the samples as a float array of shape (nframes,) if mono, else (nframes, nchannels)
+            For mono and multichannel 32 bits float files the memory map itself is returned (no copy, float32)
+        :param channel: if given, only this channel is returned (1D)
+        """
+        frames = self.frames if channel is None else self.frames[:, channel:channel + 1]
+        if frames.shape[1] == 1:
+            frames = frames[:, 0]
+        if self.float_pcm and frames.dtype.kind == 'f':
+            return frames
+        return self.decode(frames)